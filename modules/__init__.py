@@ -18,12 +18,14 @@ Data Cleaning:
     - codeAnomalyDetector: Detect and remove anomalous codes
     - descriptionCleaner: Clean and standardize descriptions
     - priceValidator: Validate pricing data
+    - cleaningPipeline: Fused single-pass row filtering
 
 Feature Engineering:
     - customerValueAnalyzer: RFM analysis
     - productAggregator: Product diversity metrics
     - behaviorAnalyzer: Shopping behavior patterns
     - locationFeatureBuilder: Geographic features
+    - featureMerger: Joins branch feature frames on CustomerID
     - cancellationAnalyzer: Cancellation patterns
     - temporalPatternExtractor: Seasonal trends
 
@@ -50,6 +52,7 @@ from .transactionProcessor import classifyTransactionStatus
 from .codeAnomalyDetector import detectCodeAnomalies
 from .descriptionCleaner import cleanDescriptions
 from .priceValidator import validatePricing
+from .cleaningPipeline import runCleaning, runCleaningPipeline
 
 # Feature Engineering Modules
 from .customerValueAnalyzer import analyzeCustomerValue
@@ -58,6 +61,7 @@ from .behaviorAnalyzer import analyzeBehaviorPatterns
 from .locationFeatureBuilder import buildLocationFeatures
 from .cancellationAnalyzer import analyzeCancellations
 from .temporalPatternExtractor import extractTemporalPatterns
+from .featureMerger import mergeFeatures
 
 # Advanced Analytics Modules
 from .outlierRemover import removeOutliers
@@ -74,6 +78,8 @@ __all__ = [
     'detectCodeAnomalies',
     'cleanDescriptions',
     'validatePricing',
+    'runCleaning',
+    'runCleaningPipeline',
     # Feature Engineering
     'analyzeCustomerValue',
     'aggregateProductData',
@@ -81,6 +87,7 @@ __all__ = [
     'buildLocationFeatures',
     'analyzeCancellations',
     'extractTemporalPatterns',
+    'mergeFeatures',
     # Advanced Analytics
     'removeOutliers',
 ]
@@ -5,22 +5,61 @@ Analyzes customer shopping behavior patterns including temporal preferences.
 Calculates metrics like purchase frequency, favorite shopping times, and intervals.
 """
 
-import pickle
+import gc
+import logging
 import os
 from pathlib import Path
 import pandas as pd
+import numpy as np
+
+# Optional numba dependency enables JIT-compiled groupby kernels
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True)
+    def _groupedMode(groupCodes, binValues, groupCount, binCount):
+        """
+        Per-group mode over a small fixed bin range (hours, weekdays).
+
+        Builds per-group histograms in a single O(n) pass over factorized
+        group codes, then takes the argmax bin per group. The accumulation
+        loop stays sequential so histogram increments never race.
+        """
+        histogram = np.zeros((groupCount, binCount), dtype=np.int32)
+        for rowIndex in range(groupCodes.shape[0]):
+            histogram[groupCodes[rowIndex], binValues[rowIndex]] += 1
+
+        groupModes = np.empty(groupCount, dtype=np.int64)
+        for groupIndex in range(groupCount):
+            bestBin = 0
+            bestCount = histogram[groupIndex, 0]
+            for binIndex in range(1, binCount):
+                if histogram[groupIndex, binIndex] > bestCount:
+                    bestCount = histogram[groupIndex, binIndex]
+                    bestBin = binIndex
+            groupModes[groupIndex] = bestBin
+        return groupModes
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-TRANSACTION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-PRODUCT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'product_aggregated.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'behavior_analyzed.pkl'
+TRANSACTION_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+BASE_METRICS_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'behavior_analyzed.parquet'
 
 
-def analyzeBehaviorPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
-                            productPicklePath=PRODUCT_PICKLE_PATH,
-                            outputPicklePath=OUTPUT_PICKLE_PATH):
+def analyzeBehaviorPatterns(transactionDataPath=TRANSACTION_DATA_PATH,
+                            baseMetricsPath=BASE_METRICS_PATH,
+                            outputDataPath=OUTPUT_DATA_PATH):
     """
     Analyze customer shopping behavior patterns.
     
@@ -30,25 +69,25 @@ def analyzeBehaviorPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     
     Parameters
     ----------
-    transactionPicklePath : str or Path, optional
-        Path to transaction data pickle file
-        Default: TRANSACTION_PICKLE_PATH
-    productPicklePath : str or Path, optional
-        Path to product aggregated data pickle file
-        Default: PRODUCT_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    transactionDataPath : str or Path, optional
+        Path to transaction data file
+        Default: TRANSACTION_DATA_PATH
+    baseMetricsPath : str or Path, optional
+        Path to the per-customer base metrics the new columns join onto
+        Default: BASE_METRICS_PATH
+    outputDataPath : str or Path, optional
         Path where behavior analysis will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the behavior analysis pickle file
+        Path to the behavior analysis data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle files don't exist
+        If source data files don't exist
         
     Examples
     --------
@@ -56,124 +95,155 @@ def analyzeBehaviorPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     >>> print(f"Behavior analysis saved to: {behaviorPath}")
     """
     # Convert to Path objects
-    transactionPicklePath = Path(transactionPicklePath)
-    productPicklePath = Path(productPicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    transactionDataPath = Path(transactionDataPath)
+    baseMetricsPath = Path(baseMetricsPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("CUSTOMER BEHAVIOR ANALYSIS")
-    print("=" * 60)
-    print(f"Transaction data: {transactionPicklePath}")
-    print(f"Product data: {productPicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("CUSTOMER BEHAVIOR ANALYSIS")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Transaction data: {transactionDataPath}")
+    logger.info(f"Base metrics: {baseMetricsPath}")
+    logger.info(f"Output: {outputDataPath}")
     
     # Load transaction data
-    if not transactionPicklePath.exists():
-        errorMsg = f"Transaction data file not found: {transactionPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(transactionDataPath):
+        errorMsg = f"Transaction data file not found: {transactionDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(transactionPicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
+    # Behavioral metrics only need customer and timestamp columns
+    transactionData = loadDataFrame(transactionDataPath, columns=['CustomerID', 'InvoiceDate'])
     
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
     
-    # Load product aggregated customer data
-    if not productPicklePath.exists():
-        errorMsg = f"Product data file not found: {productPicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load base customer metrics
+    if not frameExists(baseMetricsPath):
+        errorMsg = f"Base metrics file not found: {baseMetricsPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(productPicklePath, "rb") as fileHandle:
-        customerMetrics = pickle.load(fileHandle)
+    customerMetrics = loadDataFrame(baseMetricsPath)
     
-    print(f"✓ Loaded {len(customerMetrics):,} customer records")
+    logger.info(f"✓ Loaded {len(customerMetrics):,} customer records")
     
-    # Extract temporal features
-    print(f"\nExtracting temporal features...")
-    transactionData['InvoiceDate'] = pd.to_datetime(transactionData['InvoiceDate'])
-    transactionData['InvoiceDay'] = transactionData['InvoiceDate'].dt.date
+    # Extract temporal features; InvoiceDate is already datetime64 in the
+    # columnar cache, so reparsing only happens for legacy pickle inputs
+    logger.info("\nExtracting temporal features...")
+    if not pd.api.types.is_datetime64_any_dtype(transactionData['InvoiceDate']):
+        transactionData['InvoiceDate'] = pd.to_datetime(
+            transactionData['InvoiceDate'], format='%Y-%m-%d %H:%M:%S', cache=True
+        )
     transactionData['Day_Of_Week'] = transactionData['InvoiceDate'].dt.dayofweek
     transactionData['Hour'] = transactionData['InvoiceDate'].dt.hour
     
     # Calculate average days between purchases
-    print(f"Calculating purchase intervals...")
-    daysBetweenPurchases = (
-        transactionData.groupby('CustomerID')['InvoiceDay']
-        .apply(lambda x: (x.diff().dropna()).apply(lambda y: y.days))
-    )
-    
+    # Sort once by customer and date, then diff the whole datetime64 buffer;
+    # a mask keeps only consecutive rows belonging to the same customer
+    logger.info("Calculating purchase intervals...")
+    sortedTransactions = transactionData.sort_values(['CustomerID', 'InvoiceDate'])
+    customerIds = sortedTransactions['CustomerID'].to_numpy()
+    purchaseDates = sortedTransactions['InvoiceDate'].to_numpy().astype('datetime64[D]')
+    dayGaps = np.diff(purchaseDates).astype('int64')
+    sameCustomerMask = customerIds[1:] == customerIds[:-1]
+
     averageDaysBetweenPurchases = (
-        daysBetweenPurchases.groupby('CustomerID').mean().reset_index()
-    )
-    averageDaysBetweenPurchases.rename(
-        columns={'InvoiceDay': 'Average_Days_Between_Purchases'}, 
-        inplace=True
+        pd.DataFrame({
+            'CustomerID': customerIds[1:][sameCustomerMask],
+            'Average_Days_Between_Purchases': dayGaps[sameCustomerMask]
+        })
+        .groupby('CustomerID')['Average_Days_Between_Purchases']
+        .mean()
     )
     
-    # Identify favorite shopping day of week
-    print(f"Identifying shopping day preferences...")
-    favoriteShoppingDay = (
-        transactionData.groupby(['CustomerID', 'Day_Of_Week'])
-        .size()
-        .reset_index(name='Count')
-    )
-    favoriteShoppingDay = (
-        favoriteShoppingDay.loc[
-            favoriteShoppingDay.groupby('CustomerID')['Count'].idxmax()
-        ][['CustomerID', 'Day_Of_Week']]
-    )
-    
-    # Identify favorite shopping hour
-    print(f"Identifying shopping hour preferences...")
-    favoriteShoppingHour = (
-        transactionData.groupby(['CustomerID', 'Hour'])
-        .size()
-        .reset_index(name='Count')
-    )
-    favoriteShoppingHour = (
-        favoriteShoppingHour.loc[
-            favoriteShoppingHour.groupby('CustomerID')['Count'].idxmax()
-        ][['CustomerID', 'Hour']]
-    )
-    
-    # Merge all behavioral metrics
-    print(f"\nMerging behavioral metrics...")
-    customerMetrics = pd.merge(
-        customerMetrics, 
-        averageDaysBetweenPurchases, 
-        on='CustomerID',
-        how='left'
-    )
-    customerMetrics = pd.merge(
-        customerMetrics, 
-        favoriteShoppingDay, 
-        on='CustomerID',
-        how='left'
-    )
-    customerMetrics = pd.merge(
-        customerMetrics, 
-        favoriteShoppingHour, 
-        on='CustomerID',
-        how='left'
+    # Identify favorite shopping day of week and hour
+    logger.info("Identifying shopping day preferences...")
+    if NUMBA_AVAILABLE:
+        # Single O(n) histogram pass per metric; factorized customer codes
+        # index the histogram rows, so no sort or MultiIndex is built
+        customerCodes, uniqueCustomers = pd.factorize(transactionData['CustomerID'])
+        customerIndex = pd.Index(uniqueCustomers, name='CustomerID')
+        favoriteShoppingDay = pd.DataFrame(
+            {'Day_Of_Week': _groupedMode(
+                customerCodes,
+                transactionData['Day_Of_Week'].to_numpy(dtype='int64'),
+                len(uniqueCustomers),
+                7
+            )},
+            index=customerIndex
+        )
+        logger.info("Identifying shopping hour preferences...")
+        favoriteShoppingHour = pd.DataFrame(
+            {'Hour': _groupedMode(
+                customerCodes,
+                transactionData['Hour'].to_numpy(dtype='int64'),
+                len(uniqueCustomers),
+                24
+            )},
+            index=customerIndex
+        )
+    else:
+        # Sort counts descending and keep the first row per customer; this
+        # stays in vectorized code and avoids a second groupby plus a
+        # MultiIndex gather. The bin column is an ascending tie-breaker so
+        # equal counts resolve to the lowest day/hour, matching the numba
+        # histogram kernel (pandas' default sort is not stable)
+        favoriteShoppingDay = (
+            transactionData.groupby(['CustomerID', 'Day_Of_Week'])
+            .size()
+            .reset_index(name='Count')
+        )
+        favoriteShoppingDay = (
+            favoriteShoppingDay.sort_values(
+                ['CustomerID', 'Count', 'Day_Of_Week'], ascending=[True, False, True]
+            )
+            .drop_duplicates('CustomerID', keep='first')[['CustomerID', 'Day_Of_Week']]
+            .set_index('CustomerID')
+        )
+
+        logger.info("Identifying shopping hour preferences...")
+        favoriteShoppingHour = (
+            transactionData.groupby(['CustomerID', 'Hour'])
+            .size()
+            .reset_index(name='Count')
+        )
+        favoriteShoppingHour = (
+            favoriteShoppingHour.sort_values(
+                ['CustomerID', 'Count', 'Hour'], ascending=[True, False, True]
+            )
+            .drop_duplicates('CustomerID', keep='first')[['CustomerID', 'Hour']]
+            .set_index('CustomerID')
+        )
+    
+    # All behavioral metrics are computed; free the row-level frames before
+    # the join so peak RSS is bounded by the per-customer frames
+    del transactionData, sortedTransactions
+    gc.collect()
+
+    # Join all behavioral metrics in one pass on the CustomerID index; a
+    # single join builds one hash table instead of one per merge
+    logger.info("\nMerging behavioral metrics...")
+    customerMetrics = (
+        customerMetrics.set_index('CustomerID')
+        .join(
+            [averageDaysBetweenPurchases, favoriteShoppingDay, favoriteShoppingHour],
+            how='left'
+        )
+        .reset_index()
     )
     
     # Display behavior statistics
-    print(f"\nBehavior pattern statistics:")
-    print(f"  - Avg days between purchases: {customerMetrics['Average_Days_Between_Purchases'].mean():.2f}")
-    print(f"  - Most common shopping day: {customerMetrics['Day_Of_Week'].mode().values[0]}")
-    print(f"  - Most common shopping hour: {customerMetrics['Hour'].mode().values[0]}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("\nBehavior pattern statistics:")
+    logger.info(f"  - Avg days between purchases: {customerMetrics['Average_Days_Between_Purchases'].mean():.2f}")
+    logger.info(f"  - Most common shopping day: {customerMetrics['Day_Of_Week'].mode().values[0]}")
+    logger.info(f"  - Most common shopping hour: {customerMetrics['Hour'].mode().values[0]}")
     
     # Save behavior analysis
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ BEHAVIOR ANALYSIS COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Output: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ BEHAVIOR ANALYSIS COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
@@ -5,23 +5,27 @@ Analyzes order cancellation patterns and calculates cancellation metrics.
 Provides insights into customer return behavior and satisfaction indicators.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
 import pandas as pd
 import numpy as np
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-TRANSACTION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-LOCATION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'location_features.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cancellation_analyzed.pkl'
+TRANSACTION_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+BASE_METRICS_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cancellation_analyzed.parquet'
 
 
-def analyzeCancellations(transactionPicklePath=TRANSACTION_PICKLE_PATH,
-                         locationPicklePath=LOCATION_PICKLE_PATH,
-                         outputPicklePath=OUTPUT_PICKLE_PATH):
+def analyzeCancellations(transactionDataPath=TRANSACTION_DATA_PATH,
+                         baseMetricsPath=BASE_METRICS_PATH,
+                         outputDataPath=OUTPUT_DATA_PATH):
     """
     Analyze order cancellation patterns for each customer.
     
@@ -31,25 +35,25 @@ def analyzeCancellations(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     
     Parameters
     ----------
-    transactionPicklePath : str or Path, optional
-        Path to transaction data pickle file
-        Default: TRANSACTION_PICKLE_PATH
-    locationPicklePath : str or Path, optional
-        Path to location features data pickle file
-        Default: LOCATION_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    transactionDataPath : str or Path, optional
+        Path to transaction data file
+        Default: TRANSACTION_DATA_PATH
+    baseMetricsPath : str or Path, optional
+        Path to the per-customer base metrics the new columns join onto
+        Default: BASE_METRICS_PATH
+    outputDataPath : str or Path, optional
         Path where cancellation analysis will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the cancellation analysis pickle file
+        Path to the cancellation analysis data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle files don't exist
+        If source data files don't exist
         
     Examples
     --------
@@ -57,110 +61,110 @@ def analyzeCancellations(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     >>> print(f"Cancellation analysis saved to: {cancellationPath}")
     """
     # Convert to Path objects
-    transactionPicklePath = Path(transactionPicklePath)
-    locationPicklePath = Path(locationPicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    transactionDataPath = Path(transactionDataPath)
+    baseMetricsPath = Path(baseMetricsPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("CANCELLATION PATTERN ANALYSIS")
-    print("=" * 60)
-    print(f"Transaction data: {transactionPicklePath}")
-    print(f"Location data: {locationPicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("CANCELLATION PATTERN ANALYSIS")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Transaction data: {transactionDataPath}")
+    logger.info(f"Base metrics: {baseMetricsPath}")
+    logger.info(f"Output: {outputDataPath}")
     
     # Load transaction data
-    if not transactionPicklePath.exists():
-        errorMsg = f"Transaction data file not found: {transactionPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(transactionDataPath):
+        errorMsg = f"Transaction data file not found: {transactionDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(transactionPicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
+    transactionData = loadDataFrame(transactionDataPath)
     
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
     
-    # Load location customer data
-    if not locationPicklePath.exists():
-        errorMsg = f"Location data file not found: {locationPicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load base customer metrics
+    if not frameExists(baseMetricsPath):
+        errorMsg = f"Base metrics file not found: {baseMetricsPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(locationPicklePath, "rb") as fileHandle:
-        customerMetrics = pickle.load(fileHandle)
+    customerMetrics = loadDataFrame(baseMetricsPath)
     
-    print(f"✓ Loaded {len(customerMetrics):,} customer records")
+    logger.info(f"✓ Loaded {len(customerMetrics):,} customer records")
     
-    # Calculate total transactions per customer
-    print(f"\nCalculating transaction metrics...")
-    totalTransactions = (
-        transactionData.groupby('CustomerID')['InvoiceNo']
-        .nunique()
-        .reset_index()
+    # Count distinct invoices per customer without groupby().nunique(),
+    # which has no Cython fast path and builds a Python set per group.
+    # Factorize both columns, combine them into one integer key, and count
+    # the unique (customer, invoice) pairs per customer with bincount —
+    # a single sort plus a single counting pass
+    logger.info("\nCalculating transaction metrics...")
+    customerCodes, uniqueCustomers = pd.factorize(transactionData['CustomerID'])
+    invoiceCodes, uniqueInvoices = pd.factorize(transactionData['InvoiceNo'])
+    customerIndex = pd.Index(uniqueCustomers, name='CustomerID')
+
+    invoiceCount = len(uniqueInvoices)
+    combinedKeys = customerCodes.astype(np.int64) * invoiceCount + invoiceCodes
+    uniquePairKeys = np.unique(combinedKeys)
+    totalTransactions = pd.Series(
+        np.bincount(uniquePairKeys // invoiceCount, minlength=len(uniqueCustomers)),
+        index=customerIndex
     )
-    
+
     # Identify cancelled transactions (InvoiceNo starts with 'C')
-    print(f"Identifying cancelled transactions...")
-    transactionData['Transaction_Status'] = np.where(
-        transactionData['InvoiceNo'].astype(str).str.startswith('C'),
-        'Cancelled',
-        'Completed'
+    # The factorize above already produced the unique-invoice table, so the
+    # prefix test runs once per unique invoice and is broadcast to the rows
+    # through the codes; numeric invoice numbers can never be cancellations
+    logger.info("Identifying cancelled transactions...")
+    cancelledByInvoice = np.fromiter(
+        (isinstance(invoice, str) and invoice[:1] == 'C' for invoice in uniqueInvoices),
+        dtype=bool,
+        count=invoiceCount
     )
-    
+    cancelledMask = np.where(invoiceCodes >= 0, cancelledByInvoice[invoiceCodes], False)
+
     # Analyze overall cancellation rate
-    totalCancelled = (transactionData['Transaction_Status'] == 'Cancelled').sum()
+    totalCancelled = cancelledMask.sum()
     overallCancellationRate = (totalCancelled / len(transactionData)) * 100
-    print(f"\nOverall cancellation statistics:")
-    print(f"  - Total cancelled transactions: {totalCancelled:,} ({overallCancellationRate:.2f}%)")
-    
-    # Calculate cancellation frequency per customer
-    cancelledTransactions = transactionData[
-        transactionData['Transaction_Status'] == 'Cancelled'
-    ]
-    
-    cancellationFrequency = (
-        cancelledTransactions.groupby('CustomerID')['InvoiceNo']
-        .nunique()
-        .reset_index()
-    )
-    cancellationFrequency.rename(
-        columns={'InvoiceNo': 'Cancellation_Frequency'}, 
-        inplace=True
+    logger.info("\nOverall cancellation statistics:")
+    logger.info(f"  - Total cancelled transactions: {totalCancelled:,} ({overallCancellationRate:.2f}%)")
+
+    # Calculate cancellation frequency per customer by reusing the combined
+    # keys on the cancelled rows only
+    cancelledPairKeys = np.unique(combinedKeys[cancelledMask])
+    cancellationFrequency = pd.Series(
+        np.bincount(cancelledPairKeys // invoiceCount, minlength=len(uniqueCustomers)),
+        index=customerIndex,
+        name='Cancellation_Frequency'
     )
-    
-    # Merge cancellation frequency with customer metrics
-    customerMetrics = pd.merge(
-        customerMetrics,
-        cancellationFrequency,
-        on='CustomerID',
-        how='left'
+
+    # Align cancellation frequency on the CustomerID index; reindex with a
+    # default of 0 for customers without cancellations, so no NaNs are ever
+    # materialized and the column stays integer instead of promoting to float
+    customerMetrics = customerMetrics.set_index('CustomerID')
+    customerMetrics['Cancellation_Frequency'] = cancellationFrequency.reindex(
+        customerMetrics.index, fill_value=0
     )
-    
-    # Fill missing values (customers with no cancellations)
-    customerMetrics['Cancellation_Frequency'].fillna(0, inplace=True)
-    
-    # Calculate cancellation rate (cancellations / total transactions)
+
+    # Calculate cancellation rate (cancellations / total transactions) as an
+    # index-aligned division; no set_index().loc[] gather required
     customerMetrics['Cancellation_Rate'] = (
-        customerMetrics['Cancellation_Frequency'] / 
-        totalTransactions.set_index('CustomerID').loc[customerMetrics['CustomerID']]['InvoiceNo'].values
+        customerMetrics['Cancellation_Frequency'] / totalTransactions
     )
+    customerMetrics = customerMetrics.reset_index()
     
     # Display cancellation statistics
-    print(f"\nCustomer cancellation statistics:")
-    print(f"  - Customers with cancellations: {(customerMetrics['Cancellation_Frequency'] > 0).sum():,}")
-    print(f"  - Avg cancellation frequency: {customerMetrics['Cancellation_Frequency'].mean():.2f}")
-    print(f"  - Avg cancellation rate: {customerMetrics['Cancellation_Rate'].mean()*100:.2f}%")
-    print(f"  - Max cancellation rate: {customerMetrics['Cancellation_Rate'].max()*100:.2f}%")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("\nCustomer cancellation statistics:")
+    logger.info(f"  - Customers with cancellations: {(customerMetrics['Cancellation_Frequency'] > 0).sum():,}")
+    logger.info(f"  - Avg cancellation frequency: {customerMetrics['Cancellation_Frequency'].mean():.2f}")
+    logger.info(f"  - Avg cancellation rate: {customerMetrics['Cancellation_Rate'].mean()*100:.2f}%")
+    logger.info(f"  - Max cancellation rate: {customerMetrics['Cancellation_Rate'].max()*100:.2f}%")
     
     # Save cancellation analysis
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ CANCELLATION ANALYSIS COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Output: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ CANCELLATION ANALYSIS COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
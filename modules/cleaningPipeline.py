@@ -0,0 +1,210 @@
+"""
+Cleaning Pipeline Module
+
+Fuses the row-filter cleaning stages into a single in-memory pass.
+Avoids the per-stage load/save round-trips when an orchestrator already
+holds the frame.
+"""
+
+import logging
+import os
+from pathlib import Path
+import pandas as pd
+import numpy as np
+
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+from .nullValueProcessor import CRITICAL_COLUMNS
+from .recordDeduplicator import DEDUPLICATION_COLUMNS
+from .codeAnomalyDetector import MIN_NUMERIC_CHARS
+from .descriptionCleaner import SERVICE_SET, standardizeDescriptions
+from .priceValidator import MINIMUM_VALID_PRICE
+
+logger = logging.getLogger(__name__)
+
+
+# Configure project paths
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_data.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+
+
+def runCleaning(transactionData):
+    """
+    Apply the null, service-description and price filters in one pass.
+
+    The individual cleaning modules each load a data file, apply one
+    boolean row filter, and write the result back — three serialization
+    round-trips and three majority-subset copies for what is a single
+    composable mask. This function fuses those filters for callers that
+    already hold the frame in memory; the file-to-file module entry points
+    remain the pipeline-stage interface.
+
+    Parameters
+    ----------
+    transactionData : pandas.DataFrame
+        Raw transaction records with CustomerID, Description and UnitPrice
+        columns
+
+    Returns
+    -------
+    pandas.DataFrame
+        Cleaned records with nulls, service entries and invalid prices
+        removed, CustomerID narrowed to int32 and descriptions standardized
+        to uppercase categoricals
+    """
+    if not isinstance(transactionData['Description'].dtype, pd.CategoricalDtype):
+        transactionData['Description'] = transactionData['Description'].astype('category')
+
+    # Uppercase first so one case-normalized isin catches service variants,
+    # matching the stage ordering in cleanDescriptions. Null descriptions
+    # stay null through the category remap, so the notna filter still works
+    transactionData['Description'] = standardizeDescriptions(transactionData['Description'])
+
+    # One combined mask, one subset copy
+    keepMask = (
+        transactionData[CRITICAL_COLUMNS].notna().all(axis=1)
+        & ~transactionData['Description'].isin(SERVICE_SET)
+        & (transactionData['UnitPrice'] >= MINIMUM_VALID_PRICE)
+    )
+    cleanedData = transactionData.loc[keepMask].reset_index(drop=True)
+
+    # Same post-filter normalization the null stage applies
+    cleanedData['CustomerID'] = cleanedData['CustomerID'].astype('int32')
+
+    return cleanedData
+
+
+def runCleaningPipeline(sourceDataPath=SOURCE_DATA_PATH,
+                        outputDataPath=OUTPUT_DATA_PATH):
+    """
+    Run all six cleaning stages as one load-filter-save pass.
+
+    The orchestrated pipeline chains six file-to-file stages (nulls,
+    duplicates, status classification, code anomalies, descriptions,
+    prices), each paying a full load/save round-trip to apply one mask or
+    add one column. This entry point loads the raw transactions once,
+    composes every row filter into a single boolean mask, and writes the
+    price-validated output once — the frame never leaves memory between
+    steps.
+
+    Parameters
+    ----------
+    sourceDataPath : str or Path, optional
+        Path to the loaded raw transaction data file
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
+        Path where the fully cleaned data will be saved; matches the
+        output of the price-validation stage so downstream feature
+        stages are unaffected
+        Default: OUTPUT_DATA_PATH
+
+    Returns
+    -------
+    str
+        Path to the cleaned dataset data file
+
+    Raises
+    ------
+    FileNotFoundError
+        If source data file doesn't exist
+
+    Examples
+    --------
+    >>> cleanedPath = runCleaningPipeline()
+    >>> print(f"Cleaned data saved to: {cleanedPath}")
+    """
+    # Convert to Path objects
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+
+    logger.info(SECTION_BANNER)
+    logger.info("FUSED CLEANING PIPELINE")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
+        raise FileNotFoundError(errorMsg)
+
+    transactionData = loadDataFrame(sourceDataPath)
+
+    initialRecordCount = len(transactionData)
+    logger.info(f"\n✓ Loaded {initialRecordCount:,} records")
+
+    # Categorical codes for the repeated string keys, exactly as the
+    # individual stages do
+    for keyColumn in ('InvoiceNo', 'StockCode', 'Description', 'Country'):
+        if keyColumn in transactionData.columns:
+            transactionData[keyColumn] = transactionData[keyColumn].astype('category')
+
+    # Status classification from the invoice category table (see
+    # classifyTransactionStatus): one prefix test per unique invoice,
+    # broadcast through the codes
+    invoiceCategories = transactionData['InvoiceNo'].cat
+    cancelledByCategory = np.fromiter(
+        (str(invoiceNumber).startswith('C') for invoiceNumber in invoiceCategories.categories),
+        dtype=bool,
+        count=len(invoiceCategories.categories)
+    )
+    transactionData['TransactionStatus'] = pd.Categorical.from_codes(
+        cancelledByCategory[invoiceCategories.codes].astype(np.int8),
+        categories=['Completed', 'Cancelled']
+    )
+
+    # Duplicate mask on a single uint64 row hash (see eliminateDuplicates)
+    rowHashes = pd.util.hash_pandas_object(
+        transactionData[DEDUPLICATION_COLUMNS], index=False
+    ).to_numpy()
+    duplicateMask = pd.Index(rowHashes).duplicated(keep='first')
+
+    # Stock-code digit filter evaluated once per unique code (see
+    # detectCodeAnomalies); missing codes are dropped like nulls
+    stockCategories = transactionData['StockCode'].cat
+    keepByCode = np.asarray(
+        stockCategories.categories.astype(str).str.count(r'\d') >= MIN_NUMERIC_CHARS
+    )
+    stockCodes = stockCategories.codes.to_numpy()
+    codeKeepMask = np.where(stockCodes >= 0, keepByCode[stockCodes], False)
+
+    # Uppercase descriptions on the category table so the service filter
+    # catches case variants
+    transactionData['Description'] = standardizeDescriptions(transactionData['Description'])
+
+    # Every row filter composed into one mask, one subset copy
+    keepMask = (
+        transactionData[CRITICAL_COLUMNS].notna().all(axis=1).to_numpy()
+        & ~duplicateMask
+        & codeKeepMask
+        & ~transactionData['Description'].isin(SERVICE_SET).to_numpy()
+        & (transactionData['UnitPrice'].to_numpy() >= MINIMUM_VALID_PRICE)
+    )
+    cleanedData = transactionData.loc[keepMask].reset_index(drop=True)
+
+    # Post-filter normalization matching the individual stages
+    cleanedData['CustomerID'] = cleanedData['CustomerID'].astype('int32')
+    if 'Quantity' in cleanedData.columns:
+        cleanedData['Total_Spend'] = (
+            cleanedData['UnitPrice'].to_numpy(dtype=np.float32, copy=False)
+            * cleanedData['Quantity'].to_numpy(dtype=np.float32, copy=False)
+        )
+
+    finalRecordCount = len(cleanedData)
+    removedRecordCount = initialRecordCount - finalRecordCount
+
+    logger.info("\nCleaning results:")
+    logger.info(f"  - Records removed: {removedRecordCount:,}")
+    logger.info(f"  - Records retained: {finalRecordCount:,}")
+
+    # Save cleaned data
+    saveDataFrame(cleanedData, outputDataPath)
+
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ CLEANING PIPELINE COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Cleaned dataset: {outputDataPath}")
+
+    return str(outputDataPath)
@@ -5,23 +5,29 @@ Identifies and removes records with anomalous stock codes.
 Filters out codes with insufficient numeric characters indicating data quality issues.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
+import pandas as pd
+import numpy as np
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_classified.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'code_validated.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_classified.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'code_validated.parquet'
 
 # Stock code validation criteria
 MIN_NUMERIC_CHARS = 2  # Minimum numeric characters for valid stock code
 EXPECTED_CODE_LENGTH_RANGE = (5, 6)  # Normal stock codes are 5-6 digits
 
 
-def detectCodeAnomalies(sourcePicklePath=SOURCE_PICKLE_PATH,
-                       outputPicklePath=OUTPUT_PICKLE_PATH):
+def detectCodeAnomalies(sourceDataPath=SOURCE_DATA_PATH,
+                       outputDataPath=OUTPUT_DATA_PATH):
     """
     Detect and remove records with anomalous stock codes.
     
@@ -31,22 +37,22 @@ def detectCodeAnomalies(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where validated data will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the validated dataset pickle file
+        Path to the validated dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
         
     Examples
     --------
@@ -54,64 +60,65 @@ def detectCodeAnomalies(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Validated data saved to: {validatedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
-    
-    print("=" * 60)
-    print("STOCK CODE ANOMALY DETECTION")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
-    
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+    
+    logger.info(SECTION_BANNER)
+    logger.info("STOCK CODE ANOMALY DETECTION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+    
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
+    transactionData = loadDataFrame(sourceDataPath)
     
     initialRecordCount = len(transactionData)
-    print(f"\n✓ Loaded {initialRecordCount:,} records")
-    
-    # Identify unique stock codes
-    uniqueStockCodes = transactionData['StockCode'].unique()
-    print(f"✓ Found {len(uniqueStockCodes):,} unique stock codes")
-    
+    logger.info(f"\n✓ Loaded {initialRecordCount:,} records")
+    
+    # Run the digit count once per unique code on the category table and
+    # broadcast the verdict to the rows through the integer codes; the
+    # regex never touches the N-row column
+    if not isinstance(transactionData['StockCode'].dtype, pd.CategoricalDtype):
+        transactionData['StockCode'] = transactionData['StockCode'].astype('category')
+    stockCategories = transactionData['StockCode'].cat
+    logger.info(f"✓ Found {len(stockCategories.categories):,} unique stock codes")
+
     # Detect anomalous stock codes (0 or 1 numeric characters)
-    anomalousStockCodes = [
-        code for code in uniqueStockCodes
-        if sum(char.isdigit() for char in str(code)) in (0, 1)
-    ]
-    
-    print(f"\nAnomaly detection results:")
-    print(f"  - Anomalous codes found: {len(anomalousStockCodes)}")
-    
+    digitCounts = stockCategories.categories.astype(str).str.count(r'\d')
+    keepByCode = np.asarray(digitCounts >= MIN_NUMERIC_CHARS)
+    anomalousStockCodes = list(stockCategories.categories[~keepByCode].astype(str))
+
+    logger.info("\nAnomaly detection results:")
+    logger.info(f"  - Anomalous codes found: {len(anomalousStockCodes)}")
+
     if anomalousStockCodes:
-        print(f"  - Sample anomalous codes: {anomalousStockCodes[:10]}")
-    
-    # Remove records with anomalous stock codes
-    transactionData = transactionData[~transactionData['StockCode'].isin(anomalousStockCodes)]
+        logger.info(f"  - Sample anomalous codes: {anomalousStockCodes[:10]}")
+
+    # Remove records with anomalous stock codes via a single integer gather;
+    # missing codes (-1) are dropped like nulls
+    stockCodes = stockCategories.codes.to_numpy()
+    keepMask = np.where(stockCodes >= 0, keepByCode[stockCodes], False)
+    transactionData = transactionData[keepMask]
     
     finalRecordCount = len(transactionData)
     removedRecordCount = initialRecordCount - finalRecordCount
     removalPercentage = (removedRecordCount / initialRecordCount) * 100
     
-    print(f"\nCleaning results:")
-    print(f"  - Records removed: {removedRecordCount:,} ({removalPercentage:.2f}%)")
-    print(f"  - Records retained: {finalRecordCount:,}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info("\nCleaning results:")
+    logger.info(f"  - Records removed: {removedRecordCount:,} ({removalPercentage:.2f}%)")
+    logger.info(f"  - Records retained: {finalRecordCount:,}")
     
     # Save validated data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ ANOMALY DETECTION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Validated dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ ANOMALY DETECTION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Validated dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
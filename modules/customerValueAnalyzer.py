@@ -5,20 +5,32 @@ Implements RFM (Recency, Frequency, Monetary) analysis for customer segmentation
 Calculates key metrics to evaluate customer value and behavior patterns.
 """
 
-import pickle
+import gc
+import logging
 import os
 from pathlib import Path
 import pandas as pd
 
+# Optional numba dependency enables JIT-compiled groupby kernels
+try:
+    import numba  # noqa: F401
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+from .frameStore import frameColumns, frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
+
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
 
 
-def analyzeCustomerValue(sourcePicklePath=SOURCE_PICKLE_PATH,
-                        outputPicklePath=OUTPUT_PICKLE_PATH):
+def analyzeCustomerValue(sourceDataPath=SOURCE_DATA_PATH,
+                        outputDataPath=OUTPUT_DATA_PATH):
     """
     Perform RFM analysis on customer transaction data.
     
@@ -28,22 +40,22 @@ def analyzeCustomerValue(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where RFM analysis results will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the RFM analysis results pickle file
+        Path to the RFM analysis results data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
         
     Examples
     --------
@@ -51,97 +63,116 @@ def analyzeCustomerValue(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"RFM analysis saved to: {rfmPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
-    
-    print("=" * 60)
-    print("RFM CUSTOMER VALUE ANALYSIS")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
-    
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+    
+    logger.info(SECTION_BANNER)
+    logger.info("RFM CUSTOMER VALUE ANALYSIS")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+    
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
-    
-    # Convert InvoiceDate to datetime and extract date component
-    transactionData['InvoiceDate'] = pd.to_datetime(transactionData['InvoiceDate'])
-    transactionData['InvoiceDay'] = transactionData['InvoiceDate'].dt.date
-    
+    # Only the columns RFM needs; Parquet lets us skip the rest on disk.
+    # Inspect the stored schema before projecting: inputs written before
+    # the price stage persisted Total_Spend carry UnitPrice instead, and
+    # requesting an absent column would fail the read outright
+    storedColumns = frameColumns(sourceDataPath)
+    projectedColumns = ['CustomerID', 'InvoiceDate', 'InvoiceNo', 'Quantity']
+    if storedColumns is None or 'Total_Spend' in storedColumns:
+        projectedColumns.append('Total_Spend')
+    else:
+        projectedColumns.append('UnitPrice')
+    transactionData = loadDataFrame(sourceDataPath, columns=projectedColumns)
+    
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    
+    # InvoiceDate is already datetime64 in the columnar cache; reparse only
+    # for legacy pickle inputs, and with an explicit format so the parse
+    # stays on the vectorized C path. The day truncation keeps datetime64
+    # instead of per-row Python date objects
+    if not pd.api.types.is_datetime64_any_dtype(transactionData['InvoiceDate']):
+        transactionData['InvoiceDate'] = pd.to_datetime(
+            transactionData['InvoiceDate'], format='%Y-%m-%d %H:%M:%S', cache=True
+        )
+    transactionData['InvoiceDay'] = transactionData['InvoiceDate'].values.astype('datetime64[D]')
+    
+    # Compute all RFM aggregates in a single groupby pass; one hash-partition
+    # of CustomerID replaces the previous five groupbys and four merges
+    logger.info("\nCalculating RFM metrics...")
+    if 'Total_Spend' not in transactionData.columns:
+        # Legacy inputs predate the spend column persisted by the price stage
+        transactionData['Total_Spend'] = transactionData['UnitPrice'] * transactionData['Quantity']
+
+    groupedTransactions = transactionData.groupby('CustomerID', sort=False)
+
+    if NUMBA_AVAILABLE:
+        # JIT-compiled parallel kernels for the numeric sums; nunique and the
+        # date max are not supported by the numba engine and stay on the
+        # default Cython path
+        customerMetrics = (
+            groupedTransactions[['Quantity', 'Total_Spend']]
+            .sum(engine='numba', engine_kwargs={'parallel': True, 'nogil': True})
+            .rename(columns={'Quantity': 'Total_Products_Purchased'})
+        )
+        customerMetrics.insert(0, 'Last_Purchase_Day', groupedTransactions['InvoiceDay'].max())
+        customerMetrics.insert(1, 'Total_Transactions', groupedTransactions['InvoiceNo'].nunique())
+        customerMetrics = customerMetrics.reset_index()
+    else:
+        customerMetrics = (
+            groupedTransactions.agg(
+                Last_Purchase_Day=('InvoiceDay', 'max'),
+                Total_Transactions=('InvoiceNo', 'nunique'),
+                Total_Products_Purchased=('Quantity', 'sum'),
+                Total_Spend=('Total_Spend', 'sum')
+            )
+            .reset_index()
+        )
+
+    # The transaction frame is no longer needed once the aggregates exist;
+    # free it eagerly so peak RSS is bounded by the per-customer frame
+    del transactionData, groupedTransactions
+    gc.collect()
+
     # Calculate Recency: Days since last purchase
-    print("\nCalculating Recency metrics...")
-    customerLastPurchase = transactionData.groupby('CustomerID')['InvoiceDay'].max().reset_index()
-    mostRecentDate = transactionData['InvoiceDay'].max()
-    
-    customerLastPurchase['InvoiceDay'] = pd.to_datetime(customerLastPurchase['InvoiceDay'])
-    mostRecentDate = pd.to_datetime(mostRecentDate)
-    
-    customerLastPurchase['Days_Since_Last_Purchase'] = (
-        (mostRecentDate - customerLastPurchase['InvoiceDay']).dt.days
+    lastPurchaseDates = customerMetrics['Last_Purchase_Day']
+    mostRecentDate = lastPurchaseDates.max()
+    customerMetrics.insert(
+        1,
+        'Days_Since_Last_Purchase',
+        (mostRecentDate - lastPurchaseDates).dt.days
     )
-    customerLastPurchase.drop(columns=['InvoiceDay'], inplace=True)
-    
-    # Calculate Frequency: Number of unique transactions
-    print("Calculating Frequency metrics...")
-    totalTransactions = transactionData.groupby('CustomerID')['InvoiceNo'].nunique().reset_index()
-    totalTransactions.rename(columns={'InvoiceNo': 'Total_Transactions'}, inplace=True)
-    
-    # Calculate total products purchased
-    totalProductsPurchased = transactionData.groupby('CustomerID')['Quantity'].sum().reset_index()
-    totalProductsPurchased.rename(columns={'Quantity': 'Total_Products_Purchased'}, inplace=True)
-    
-    # Merge frequency metrics
-    customerMetrics = pd.merge(customerLastPurchase, totalTransactions, on='CustomerID')
-    customerMetrics = pd.merge(customerMetrics, totalProductsPurchased, on='CustomerID')
-    
-    # Calculate Monetary: Total spend and average transaction value
-    print("Calculating Monetary metrics...")
-    transactionData['Total_Spend'] = transactionData['UnitPrice'] * transactionData['Quantity']
-    totalSpend = transactionData.groupby('CustomerID')['Total_Spend'].sum().reset_index()
-    
-    averageTransactionValue = totalSpend.merge(totalTransactions, on='CustomerID')
-    averageTransactionValue['Average_Transaction_Value'] = (
-        averageTransactionValue['Total_Spend'] / averageTransactionValue['Total_Transactions']
-    )
-    
-    # Merge monetary metrics
-    customerMetrics = pd.merge(customerMetrics, totalSpend, on='CustomerID')
-    customerMetrics = pd.merge(
-        customerMetrics,
-        averageTransactionValue[['CustomerID', 'Average_Transaction_Value']],
-        on='CustomerID'
+    customerMetrics.drop(columns=['Last_Purchase_Day'], inplace=True)
+
+    # Calculate average transaction value via column arithmetic
+    customerMetrics['Average_Transaction_Value'] = (
+        customerMetrics['Total_Spend'] / customerMetrics['Total_Transactions']
     )
     
     # Display RFM summary statistics
-    print(f"\n{'=' * 60}")
-    print("RFM ANALYSIS SUMMARY")
-    print(f"{'=' * 60}")
-    print(f"Total unique customers: {len(customerMetrics):,}")
-    print(f"\nRecency (Days Since Last Purchase):")
-    print(f"  - Mean: {customerMetrics['Days_Since_Last_Purchase'].mean():.2f} days")
-    print(f"  - Median: {customerMetrics['Days_Since_Last_Purchase'].median():.2f} days")
-    print(f"\nFrequency (Total Transactions):")
-    print(f"  - Mean: {customerMetrics['Total_Transactions'].mean():.2f}")
-    print(f"  - Median: {customerMetrics['Total_Transactions'].median():.2f}")
-    print(f"\nMonetary (Total Spend):")
-    print(f"  - Mean: ${customerMetrics['Total_Spend'].mean():.2f}")
-    print(f"  - Median: ${customerMetrics['Total_Spend'].median():.2f}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("RFM ANALYSIS SUMMARY")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Total unique customers: {len(customerMetrics):,}")
+    logger.info("\nRecency (Days Since Last Purchase):")
+    logger.info(f"  - Mean: {customerMetrics['Days_Since_Last_Purchase'].mean():.2f} days")
+    logger.info(f"  - Median: {customerMetrics['Days_Since_Last_Purchase'].median():.2f} days")
+    logger.info("\nFrequency (Total Transactions):")
+    logger.info(f"  - Mean: {customerMetrics['Total_Transactions'].mean():.2f}")
+    logger.info(f"  - Median: {customerMetrics['Total_Transactions'].median():.2f}")
+    logger.info("\nMonetary (Total Spend):")
+    logger.info(f"  - Mean: ${customerMetrics['Total_Spend'].mean():.2f}")
+    logger.info(f"  - Median: ${customerMetrics['Total_Spend'].median():.2f}")
     
     # Save RFM analysis results
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n✓ RFM analysis completed and saved")
-    print(f"Output: {outputPicklePath}")
+    logger.info("\n✓ RFM analysis completed and saved")
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
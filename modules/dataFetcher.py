@@ -5,10 +5,22 @@ Handles downloading of e-commerce datasets from remote sources.
 Supports HTTP/HTTPS protocols with timeout and error handling.
 """
 
+import logging
 import os
 from pathlib import Path
 import requests
 from requests.exceptions import RequestException, Timeout
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
+
+# Optional progress bar; tqdm rate-limits its redraws (10 Hz) instead of
+# writing to the terminal on every chunk
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
 
 
 # Default UCI repository URL for online retail dataset
@@ -16,7 +28,8 @@ UCI_DATASET_URL = "https://archive.ics.uci.edu/static/public/352/online+retail.z
 
 # HTTP request configuration
 REQUEST_TIMEOUT_SECONDS = 45
-CHUNK_SIZE_BYTES = 8192
+CHUNK_SIZE_BYTES = 1 << 20  # 1MB chunks; 8KB meant ~5700 write+print rounds
+PROGRESS_REPORT_INTERVAL = 8  # Report every 8 chunks (~8MB)
 
 
 def fetchDataset(sourceUrl=UCI_DATASET_URL, timeoutSeconds=REQUEST_TIMEOUT_SECONDS):
@@ -55,11 +68,11 @@ def fetchDataset(sourceUrl=UCI_DATASET_URL, timeoutSeconds=REQUEST_TIMEOUT_SECON
     >>> archivePath = fetchDataset()
     >>> print(f"Dataset downloaded to: {archivePath}")
     """
-    print("=" * 60)
-    print("DATASET DOWNLOAD INITIATED")
-    print("=" * 60)
-    print(f"Source URL: {sourceUrl}")
-    print(f"Timeout: {timeoutSeconds}s")
+    logger.info(SECTION_BANNER)
+    logger.info("DATASET DOWNLOAD INITIATED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source URL: {sourceUrl}")
+    logger.info(f"Timeout: {timeoutSeconds}s")
     
     # Determine project root and create datasets directory
     projectRoot = Path(__file__).parent.parent.absolute()
@@ -71,7 +84,7 @@ def fetchDataset(sourceUrl=UCI_DATASET_URL, timeoutSeconds=REQUEST_TIMEOUT_SECON
     
     try:
         # Execute HTTP GET request with timeout
-        print("\nConnecting to remote server...")
+        logger.info("\nConnecting to remote server...")
         httpResponse = requests.get(
             sourceUrl, 
             timeout=timeoutSeconds,
@@ -84,51 +97,64 @@ def fetchDataset(sourceUrl=UCI_DATASET_URL, timeoutSeconds=REQUEST_TIMEOUT_SECON
         # Calculate total file size if available
         totalSize = int(httpResponse.headers.get('content-length', 0))
         
-        print(f"✓ Connection established")
+        logger.info(f"✓ Connection established")
         if totalSize:
-            print(f"✓ Dataset size: {totalSize / (1024*1024):.2f} MB")
+            logger.info(f"✓ Dataset size: {totalSize / (1024*1024):.2f} MB")
         
         # Write content to file
-        print(f"\nDownloading to: {archiveDestinationPath}")
+        logger.info(f"\nDownloading to: {archiveDestinationPath}")
         with open(archiveDestinationPath, "wb") as fileHandle:
-            if totalSize:
-                # Download with progress tracking
+            if totalSize and TQDM_AVAILABLE:
+                # tqdm refreshes at most a few times per second; the loop
+                # body reduces to a write plus a counter increment
+                with tqdm(total=totalSize, unit='B', unit_scale=True,
+                          desc='Downloading') as progressBar:
+                    for chunk in httpResponse.iter_content(chunk_size=CHUNK_SIZE_BYTES):
+                        if chunk:
+                            fileHandle.write(chunk)
+                            progressBar.update(len(chunk))
+            elif totalSize:
+                # Download with progress tracking; report once every few
+                # chunks instead of formatting and flushing per write
                 downloadedBytes = 0
+                chunkCount = 0
                 for chunk in httpResponse.iter_content(chunk_size=CHUNK_SIZE_BYTES):
                     if chunk:
                         fileHandle.write(chunk)
                         downloadedBytes += len(chunk)
-                        progress = (downloadedBytes / totalSize) * 100
-                        print(f"\rProgress: {progress:.1f}%", end='', flush=True)
-                print()  # New line after progress
+                        chunkCount += 1
+                        if chunkCount % PROGRESS_REPORT_INTERVAL == 0:
+                            progress = (downloadedBytes / totalSize) * 100
+                            logger.info(f"Progress: {progress:.1f}%")
+                logger.info("Progress: 100.0%")
             else:
                 # Download without progress tracking
                 fileHandle.write(httpResponse.content)
         
-        print(f"\n{'=' * 60}")
-        print("✓ DOWNLOAD COMPLETED SUCCESSFULLY")
-        print(f"{'=' * 60}")
-        print(f"Archive location: {archiveDestinationPath}")
+        logger.info('\n' + SECTION_BANNER)
+        logger.info("✓ DOWNLOAD COMPLETED SUCCESSFULLY")
+        logger.info(SECTION_BANNER)
+        logger.info(f"Archive location: {archiveDestinationPath}")
         
         return str(archiveDestinationPath)
         
     except Timeout:
         errorMsg = f"✗ Download timeout after {timeoutSeconds}s"
-        print(f"\n{errorMsg}")
+        logger.error(f"\n{errorMsg}")
         raise Timeout(errorMsg)
-        
+
     except RequestException as requestError:
         errorMsg = f"✗ Download failed: {str(requestError)}"
-        print(f"\n{errorMsg}")
+        logger.error(f"\n{errorMsg}")
         raise RequestException(errorMsg)
-        
+
     except IOError as ioError:
         errorMsg = f"✗ File write error: {str(ioError)}"
-        print(f"\n{errorMsg}")
+        logger.error(f"\n{errorMsg}")
         raise IOError(errorMsg)
 
 
 if __name__ == "__main__":
     # Execute dataset download when run as script
     downloadedArchive = fetchDataset(UCI_DATASET_URL)
-    print(f"\nDataset ready at: {downloadedArchive}")
+    logger.info(f"\nDataset ready at: {downloadedArchive}")
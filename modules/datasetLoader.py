@@ -2,50 +2,63 @@
 Dataset Loading Module
 
 This module provides functionality for loading e-commerce transaction datasets
-from various file formats including pickle and Excel files.
+from various file formats including Parquet, legacy pickle, and Excel files.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
 import pandas as pd
 
+# Optional Rust-backed Excel parser; streams rows instead of building the
+# full openpyxl DOM, which cuts first-load time and peak memory sharply
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
+
 
 # Configure project root directory path
 ROOT_DIRECTORY = Path(__file__).parent.parent.absolute()
 
 # Define default file paths for dataset storage
-PICKLE_STORAGE_PATH = ROOT_DIRECTORY / 'datasets' / 'processed' / 'transaction_data.pkl'
+CACHE_STORAGE_PATH = ROOT_DIRECTORY / 'datasets' / 'processed' / 'transaction_data.parquet'
 EXCEL_SOURCE_PATH = ROOT_DIRECTORY / 'datasets' / 'Online Retail.xlsx'
 
 
-def loadDataset(pickleFilePath=PICKLE_STORAGE_PATH, excelFilePath=EXCEL_SOURCE_PATH):
+def loadDataset(cacheFilePath=CACHE_STORAGE_PATH, excelFilePath=EXCEL_SOURCE_PATH):
     """
     Load e-commerce transaction dataset from available sources.
-    
-    This function attempts to load data from a pickle file first for performance.
-    If unavailable, it falls back to loading from an Excel file. The loaded data
-    is automatically persisted as a pickle file for future efficient access.
-    
+
+    This function attempts to load data from the columnar cache first for
+    performance. If unavailable, it falls back to loading from an Excel file.
+    The loaded data is automatically persisted as Parquet for future
+    efficient access.
+
     Parameters
     ----------
-    pickleFilePath : str or Path, optional
-        File path to the serialized pickle dataset
-        Default: PICKLE_STORAGE_PATH
+    cacheFilePath : str or Path, optional
+        File path to the cached columnar dataset
+        Default: CACHE_STORAGE_PATH
     excelFilePath : str or Path, optional
         File path to the source Excel dataset
         Default: EXCEL_SOURCE_PATH
-        
+
     Returns
     -------
     str or Path
-        Path to the persisted pickle file containing the loaded dataset
-        
+        Path to the persisted cache file containing the loaded dataset
+
     Raises
     ------
     FileNotFoundError
-        If neither pickle nor Excel file exists at specified paths
-        
+        If neither cache nor Excel file exists at specified paths
+
     Examples
     --------
     >>> dataPath = loadDataset()
@@ -53,37 +66,68 @@ def loadDataset(pickleFilePath=PICKLE_STORAGE_PATH, excelFilePath=EXCEL_SOURCE_P
     """
     # Initialize dataframe container
     transactionData = None
-    
+
     # Convert paths to Path objects for better handling
-    pickleFilePath = Path(pickleFilePath)
+    cacheFilePath = Path(cacheFilePath)
     excelFilePath = Path(excelFilePath)
-    
-    # Attempt to load from pickle file (faster)
-    if pickleFilePath.exists():
-        with open(pickleFilePath, "rb") as fileHandle:
-            transactionData = pickle.load(fileHandle)
-        print(f"✓ Dataset successfully loaded from pickle: {pickleFilePath}")
-        
-    # Fallback to Excel file if pickle unavailable
-    elif excelFilePath.exists():
-        transactionData = pd.read_excel(excelFilePath, engine='openpyxl')
-        print(f"✓ Dataset loaded from Excel source: {excelFilePath}")
-        
+
+    # Attempt to load from cache (faster); legacy pickle caches are handled
+    # transparently by the frame store. A cache hit is already persisted,
+    # so skip the redundant serialization round-trip and return directly
+    if frameExists(cacheFilePath):
+        transactionData = loadDataFrame(cacheFilePath)
+        logger.info(f"✓ Dataset successfully loaded from cache: {cacheFilePath}")
+        return str(cacheFilePath)
+
+    # Fallback to Excel file if cache unavailable. The dtype schema pins
+    # the mixed int/string identifier columns to str at parse time instead
+    # of letting the reader infer objects and re-converting afterwards
+    if excelFilePath.exists():
+        transactionData = pd.read_excel(
+            excelFilePath,
+            engine=EXCEL_ENGINE,
+            dtype={'InvoiceNo': str, 'StockCode': str}
+        )
+        logger.info(f"✓ Dataset loaded from Excel source: {excelFilePath}")
+
+        # Dictionary-encode the heavily repeated string columns so every
+        # downstream scan works on integer codes and the Parquet cache
+        # stores each unique string once
+        for repeatedColumn in ('InvoiceNo', 'StockCode', 'Description', 'Country'):
+            if repeatedColumn in transactionData.columns:
+                transactionData[repeatedColumn] = transactionData[repeatedColumn].astype('category')
+
+        # Parse InvoiceDate once at ingest so every downstream stage reads
+        # datetime64[ns] straight from the columnar cache; the explicit
+        # format keeps the parse on the vectorized C path
+        if 'InvoiceDate' in transactionData.columns and \
+                not pd.api.types.is_datetime64_any_dtype(transactionData['InvoiceDate']):
+            transactionData['InvoiceDate'] = pd.to_datetime(
+                transactionData['InvoiceDate'], format='%Y-%m-%d %H:%M:%S', cache=True
+            )
+
+        # Narrow numeric dtypes at ingest so every downstream stage moves
+        # half the bytes. CustomerID stays float64 here because its NaNs
+        # block integer narrowing; the null-processing stage casts it to
+        # int32 once those rows are dropped
+        if 'Quantity' in transactionData.columns:
+            transactionData['Quantity'] = pd.to_numeric(
+                transactionData['Quantity'], downcast='integer'
+            )
+        if 'UnitPrice' in transactionData.columns:
+            transactionData['UnitPrice'] = transactionData['UnitPrice'].astype('float32')
+
     else:
         errorMessage = (
             f"Dataset not found at specified locations:\n"
-            f"  - Pickle: {pickleFilePath}\n"
+            f"  - Cache: {cacheFilePath}\n"
             f"  - Excel: {excelFilePath}"
         )
-        print(f"✗ {errorMessage}")
+        logger.error(f"✗ {errorMessage}")
         raise FileNotFoundError(errorMessage)
-    
-    # Ensure output directory exists
-    pickleFilePath.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Persist dataset as pickle for future efficient loading
-    with open(pickleFilePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
-    print(f"✓ Dataset persisted to: {pickleFilePath}")
-    
-    return str(pickleFilePath)
+
+    # Persist dataset for future efficient loading
+    saveDataFrame(transactionData, cacheFilePath)
+    logger.info(f"✓ Dataset persisted to: {cacheFilePath}")
+
+    return str(cacheFilePath)
@@ -5,15 +5,21 @@ Cleans and standardizes product description text.
 Removes service-related entries and normalizes text formatting.
 """
 
+import logging
 import os
-import pickle
 from pathlib import Path
+import pandas as pd
+import numpy as np
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'code_validated.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'description_cleaned.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'code_validated.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'description_cleaned.parquet'
 
 # Service-related descriptions to exclude (not actual products)
 SERVICE_DESCRIPTIONS = [
@@ -25,9 +31,39 @@ SERVICE_DESCRIPTIONS = [
     "Adjust bad debt"
 ]
 
+# Case-normalized needle set; filtering happens after the uppercase pass so
+# mixed-case variants of the service entries are caught too
+SERVICE_SET = frozenset(description.upper() for description in SERVICE_DESCRIPTIONS)
+
+
+def standardizeDescriptions(descriptionSeries):
+    """
+    Uppercase a categorical description column via its category table.
+
+    The string work runs once over the unique categories — O(unique), not
+    O(rows) — and rows are remapped with an integer gather. Factorize merges
+    categories that collapse to the same uppercase form.
+
+    Parameters
+    ----------
+    descriptionSeries : pandas.Series
+        Categorical series of product descriptions
+
+    Returns
+    -------
+    pandas.Categorical
+        Uppercased categorical values aligned with the input rows
+    """
+    descriptionCategories = descriptionSeries.cat.remove_unused_categories()
+    upperCodes, upperCategories = pd.factorize(descriptionCategories.cat.categories.str.upper())
+    rowCodes = descriptionCategories.cat.codes.to_numpy()
+    # Preserve nulls: their -1 codes must not gather a real category
+    newCodes = np.where(rowCodes >= 0, upperCodes[rowCodes], -1)
+    return pd.Categorical.from_codes(newCodes, upperCategories)
+
 
-def cleanDescriptions(sourcePicklePath=SOURCE_PICKLE_PATH,
-                     outputPicklePath=OUTPUT_PICKLE_PATH):
+def cleanDescriptions(sourceDataPath=SOURCE_DATA_PATH,
+                     outputDataPath=OUTPUT_DATA_PATH):
     """
     Clean and standardize product descriptions.
     
@@ -37,22 +73,22 @@ def cleanDescriptions(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where cleaned data will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the cleaned dataset pickle file
+        Path to the cleaned dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
         
     Examples
     --------
@@ -60,63 +96,68 @@ def cleanDescriptions(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Cleaned data saved to: {cleanedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
-    
-    print("=" * 60)
-    print("DESCRIPTION CLEANING & STANDARDIZATION")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
-    
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+    
+    logger.info(SECTION_BANNER)
+    logger.info("DESCRIPTION CLEANING & STANDARDIZATION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+    
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
+    transactionData = loadDataFrame(sourceDataPath)
+
     initialRecordCount = len(transactionData)
-    print(f"\n✓ Loaded {initialRecordCount:,} records")
-    
+    logger.info(f"\n✓ Loaded {initialRecordCount:,} records")
+
+    # Categorize descriptions so the filter and case normalization below
+    # work on the small category table (unique strings) instead of touching
+    # every row's Python string
+    transactionData['Description'] = transactionData['Description'].astype('category')
+
+    # Standardize descriptions to uppercase on the category table only;
+    # normalizing first lets one filter catch mixed-case service variants
+    logger.info(f"\n✓ Standardizing descriptions to uppercase...")
+    transactionData['Description'] = standardizeDescriptions(transactionData['Description'])
+
     # Display service descriptions to be removed
-    print(f"\nService-related descriptions to exclude:")
-    for desc in SERVICE_DESCRIPTIONS:
-        print(f"  - {desc}")
-    
-    # Remove service-related descriptions
+    logger.info(f"\nService-related descriptions to exclude:")
+    for desc in sorted(SERVICE_SET):
+        logger.info(f"  - {desc}")
+
+    # Remove service-related descriptions by comparing category codes: the
+    # needle strings resolve to a handful of integer codes via the category
+    # table, and the row filter is a branchless np.isin over those codes
+    needleCodes = transactionData['Description'].cat.categories.get_indexer(sorted(SERVICE_SET))
+    needleCodes = needleCodes[needleCodes >= 0]
     transactionData = transactionData[
-        ~transactionData['Description'].isin(SERVICE_DESCRIPTIONS)
+        ~np.isin(transactionData['Description'].cat.codes.to_numpy(), needleCodes)
     ]
-    
+
     removedServiceRecords = initialRecordCount - len(transactionData)
-    print(f"\n✓ Removed {removedServiceRecords:,} service-related records")
-    
-    # Standardize descriptions to uppercase
-    print(f"✓ Standardizing descriptions to uppercase...")
-    transactionData['Description'] = transactionData['Description'].str.upper()
+    logger.info(f"\n✓ Removed {removedServiceRecords:,} service-related records")
     
     # Display sample cleaned descriptions
     sampleDescriptions = transactionData['Description'].head(5).tolist()
-    print(f"\nSample standardized descriptions:")
+    logger.info(f"\nSample standardized descriptions:")
     for idx, desc in enumerate(sampleDescriptions, 1):
-        print(f"  {idx}. {desc[:60]}...")
+        logger.info(f"  {idx}. {desc[:60]}...")
     
     finalRecordCount = len(transactionData)
-    print(f"\nFinal record count: {finalRecordCount:,}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"\nFinal record count: {finalRecordCount:,}")
     
     # Save cleaned data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ DESCRIPTION CLEANING COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Cleaned dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ DESCRIPTION CLEANING COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Cleaned dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
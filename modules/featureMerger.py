@@ -0,0 +1,126 @@
+"""
+Feature Merger Module
+
+Combines independently built feature frames into one customer table.
+Lets the orchestrator run the feature branches concurrently and join
+their outputs on CustomerID at the end.
+"""
+
+import logging
+import os
+from pathlib import Path
+import pandas as pd
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
+
+
+# Configure project paths
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+RFM_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+FEATURE_DATA_PATHS = [
+    PROJECT_ROOT / 'datasets' / 'processed' / 'product_aggregated.parquet',
+    PROJECT_ROOT / 'datasets' / 'processed' / 'behavior_analyzed.parquet',
+    PROJECT_ROOT / 'datasets' / 'processed' / 'location_features.parquet',
+    PROJECT_ROOT / 'datasets' / 'processed' / 'cancellation_analyzed.parquet',
+    PROJECT_ROOT / 'datasets' / 'processed' / 'temporal_features.parquet',
+]
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'customer_features.parquet'
+
+
+def mergeFeatures(rfmDataPath=RFM_DATA_PATH,
+                  featureDataPaths=None,
+                  outputDataPath=OUTPUT_DATA_PATH):
+    """
+    Merge branch feature frames into the final customer feature table.
+
+    Each feature branch starts from the shared RFM base and writes a
+    frame carrying the base columns plus its own features. This function
+    joins only the new columns of each branch back onto the base, so
+    branches can run in any order — or concurrently — without chaining
+    their outputs through one another.
+
+    Parameters
+    ----------
+    rfmDataPath : str or Path, optional
+        Path to the RFM base data file
+        Default: RFM_DATA_PATH
+    featureDataPaths : list of str or Path, optional
+        Paths to the branch feature data files; None uses the standard
+        five branch outputs
+        Default: None
+    outputDataPath : str or Path, optional
+        Path where the merged customer features will be saved
+        Default: OUTPUT_DATA_PATH
+
+    Returns
+    -------
+    str
+        Path to the merged customer features data file
+
+    Raises
+    ------
+    FileNotFoundError
+        If the RFM base or a branch feature file doesn't exist
+
+    Examples
+    --------
+    >>> featuresPath = mergeFeatures()
+    >>> print(f"Customer features saved to: {featuresPath}")
+    """
+    # Convert to Path objects
+    rfmDataPath = Path(rfmDataPath)
+    if featureDataPaths is None:
+        featureDataPaths = FEATURE_DATA_PATHS
+    featureDataPaths = [Path(featurePath) for featurePath in featureDataPaths]
+    outputDataPath = Path(outputDataPath)
+
+    logger.info(SECTION_BANNER)
+    logger.info("FEATURE MERGE")
+    logger.info(SECTION_BANNER)
+    logger.info(f"RFM base: {rfmDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+
+    # Load RFM base
+    if not frameExists(rfmDataPath):
+        errorMsg = f"RFM data file not found: {rfmDataPath}"
+        logger.error(f"✗ {errorMsg}")
+        raise FileNotFoundError(errorMsg)
+
+    customerFeatures = loadDataFrame(rfmDataPath)
+    logger.info(f"\n✓ Loaded {len(customerFeatures):,} customer records")
+
+    # Join each branch's new columns onto the base; columns the branch
+    # inherited from the base are skipped so nothing is merged twice
+    for featurePath in featureDataPaths:
+        if not frameExists(featurePath):
+            errorMsg = f"Feature data file not found: {featurePath}"
+            logger.error(f"✗ {errorMsg}")
+            raise FileNotFoundError(errorMsg)
+
+        branchFeatures = loadDataFrame(featurePath)
+        newColumns = ['CustomerID'] + [
+            column for column in branchFeatures.columns
+            if column != 'CustomerID' and column not in customerFeatures.columns
+        ]
+        customerFeatures = customerFeatures.merge(
+            branchFeatures[newColumns],
+            on='CustomerID',
+            how='left',
+            validate='1:1'
+        )
+        logger.info(f"✓ Merged {len(newColumns) - 1} columns from {featurePath.name}")
+
+    logger.info(f"\n✓ Final feature table: {len(customerFeatures):,} customers, "
+                f"{len(customerFeatures.columns)} columns")
+
+    # Save merged features
+    saveDataFrame(customerFeatures, outputDataPath)
+
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ FEATURE MERGE COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
+
+    return str(outputDataPath)
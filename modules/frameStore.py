@@ -0,0 +1,286 @@
+"""
+Frame Store Module
+
+Shared persistence helpers for intermediate pipeline DataFrames.
+Stores stage outputs as columnar Parquet files while remaining able to
+read legacy pickle artifacts produced by earlier pipeline versions.
+"""
+
+import os
+import pickle
+from pathlib import Path
+import pandas as pd
+import pyarrow.parquet
+
+
+# Columnar storage configuration
+PARQUET_ENGINE = 'pyarrow'
+PARQUET_COMPRESSION = 'zstd'
+
+# Buffer size for legacy pickle file handles
+PICKLE_BUFFER_SIZE = 1 << 20
+
+
+def _legacyPicklePath(dataFilePath):
+    """
+    Return the legacy pickle sibling for a Parquet artifact path.
+
+    Parameters
+    ----------
+    dataFilePath : Path
+        Path to a pipeline artifact
+
+    Returns
+    -------
+    Path
+        Same path with a '.pkl' suffix
+    """
+    return dataFilePath.with_suffix('.pkl')
+
+
+def frameExists(dataFilePath):
+    """
+    Check whether a pipeline DataFrame artifact is available.
+
+    A Parquet artifact counts as available if either the Parquet file itself
+    or its legacy pickle sibling exists on disk.
+
+    Parameters
+    ----------
+    dataFilePath : str or Path
+        Path to the artifact to check
+
+    Returns
+    -------
+    bool
+        True if the artifact (or a legacy pickle fallback) exists
+    """
+    dataFilePath = Path(dataFilePath)
+
+    if dataFilePath.exists():
+        return True
+
+    if dataFilePath.suffix == '.parquet':
+        return _legacyPicklePath(dataFilePath).exists()
+
+    return False
+
+
+def frameColumns(dataFilePath):
+    """
+    Return the column names stored in a pipeline artifact, or None.
+
+    Lets stages inspect what an input actually carries before deciding
+    which columns to project, so a projection never requests a column the
+    artifact predates. Parquet schemas are read from the file footer
+    without touching row data; legacy pickle artifacts have no separate
+    schema and must be fully loaded.
+
+    Parameters
+    ----------
+    dataFilePath : str or Path
+        Path to the artifact to inspect
+
+    Returns
+    -------
+    list of str or None
+        Column names in storage order, or None if no artifact exists
+    """
+    resolvedPath = _resolveArtifactPath(dataFilePath)
+    if resolvedPath is None:
+        return None
+
+    if resolvedPath.suffix == '.parquet':
+        return list(pyarrow.parquet.read_schema(resolvedPath).names)
+
+    with open(resolvedPath, "rb", buffering=PICKLE_BUFFER_SIZE) as fileHandle:
+        return list(pickle.load(fileHandle).columns)
+
+
+def loadDataFrame(dataFilePath, columns=None):
+    """
+    Load an intermediate pipeline DataFrame.
+
+    Parquet artifacts are read columnarly, so stages can request only the
+    columns they use. If the Parquet file is missing but a legacy pickle
+    sibling exists, the pickle is loaded instead for backwards compatibility.
+
+    Parameters
+    ----------
+    dataFilePath : str or Path
+        Path to the artifact to load
+    columns : list of str, optional
+        Subset of columns to load; None loads all columns
+
+    Returns
+    -------
+    pd.DataFrame
+        The loaded DataFrame
+
+    Raises
+    ------
+    FileNotFoundError
+        If neither the artifact nor a legacy pickle fallback exists
+    """
+    dataFilePath = Path(dataFilePath)
+
+    if dataFilePath.exists():
+        if dataFilePath.suffix == '.parquet':
+            return pd.read_parquet(dataFilePath, columns=columns, engine=PARQUET_ENGINE)
+
+        with open(dataFilePath, "rb", buffering=PICKLE_BUFFER_SIZE) as fileHandle:
+            frameData = pickle.load(fileHandle)
+        if columns is not None:
+            frameData = frameData[list(columns)]
+        return frameData
+
+    # Fall back to a legacy pickle artifact from an earlier pipeline version
+    if dataFilePath.suffix == '.parquet':
+        legacyPath = _legacyPicklePath(dataFilePath)
+        if legacyPath.exists():
+            with open(legacyPath, "rb", buffering=PICKLE_BUFFER_SIZE) as fileHandle:
+                frameData = pickle.load(fileHandle)
+            if columns is not None:
+                frameData = frameData[list(columns)]
+            return frameData
+
+    raise FileNotFoundError(f"Data file not found: {dataFilePath}")
+
+
+def saveDataFrame(frameData, dataFilePath):
+    """
+    Persist an intermediate pipeline DataFrame.
+
+    Paths with a '.parquet' suffix are written as compressed columnar
+    Parquet; any other suffix falls back to highest-protocol pickle.
+
+    Parameters
+    ----------
+    frameData : pd.DataFrame
+        DataFrame to persist
+    dataFilePath : str or Path
+        Destination path for the artifact
+
+    Returns
+    -------
+    str
+        Path to the written artifact
+    """
+    dataFilePath = Path(dataFilePath)
+    dataFilePath.parent.mkdir(parents=True, exist_ok=True)
+
+    if dataFilePath.suffix == '.parquet':
+        frameData.to_parquet(
+            dataFilePath,
+            engine=PARQUET_ENGINE,
+            compression=PARQUET_COMPRESSION,
+            index=False
+        )
+    else:
+        with open(dataFilePath, "wb", buffering=PICKLE_BUFFER_SIZE) as fileHandle:
+            pickle.dump(frameData, fileHandle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return str(dataFilePath)
+
+
+def _resolveArtifactPath(dataFilePath):
+    """
+    Return the on-disk file backing an artifact path, or None.
+
+    Resolves a '.parquet' path to its legacy pickle sibling when only the
+    pickle exists, mirroring the fallback in loadDataFrame.
+    """
+    dataFilePath = Path(dataFilePath)
+    if dataFilePath.exists():
+        return dataFilePath
+    if dataFilePath.suffix == '.parquet':
+        legacyPath = _legacyPicklePath(dataFilePath)
+        if legacyPath.exists():
+            return legacyPath
+    return None
+
+
+def _stageCacheKey(sourcePaths, stageVersion, stageParams):
+    """
+    Build the memoization key for a stage from its inputs.
+
+    The key combines each source file's mtime and size with the stage
+    version and any stage parameters, so touching an input, bumping the
+    stage logic, or calling with different parameters invalidates the
+    cached output.
+    """
+    keyParts = [f"v{stageVersion}"]
+    if stageParams:
+        keyParts.extend(
+            f"{paramName}={stageParams[paramName]!r}"
+            for paramName in sorted(stageParams)
+        )
+    for sourcePath in sourcePaths:
+        resolvedPath = _resolveArtifactPath(sourcePath)
+        if resolvedPath is None:
+            return None
+        sourceStat = os.stat(resolvedPath)
+        keyParts.append(f"{sourceStat.st_mtime_ns}:{sourceStat.st_size}")
+    return '|'.join(keyParts)
+
+
+def _stageKeyPath(outputDataPath):
+    """Return the sidecar file holding a stage output's cache key."""
+    return Path(outputDataPath).with_suffix('.key')
+
+
+def stageIsCurrent(outputDataPath, sourcePaths, stageVersion=1, stageParams=None):
+    """
+    Check whether a stage output is already up to date with its inputs.
+
+    Compares the key stored next to the output against the current key of
+    the source files; a match means the stage can be skipped entirely.
+
+    Parameters
+    ----------
+    outputDataPath : str or Path
+        Path to the stage's output artifact
+    sourcePaths : list of str or Path
+        The stage's input artifacts
+    stageVersion : int, optional
+        Version of the stage logic; bump to force recomputation
+        Default: 1
+    stageParams : dict, optional
+        Parameters the stage's output depends on; a call with different
+        values must not reuse the cached output
+        Default: None
+
+    Returns
+    -------
+    bool
+        True if the output exists and its recorded key matches the inputs
+    """
+    if not frameExists(outputDataPath):
+        return False
+    keyPath = _stageKeyPath(outputDataPath)
+    if not keyPath.exists():
+        return False
+    currentKey = _stageCacheKey(sourcePaths, stageVersion, stageParams)
+    return currentKey is not None and keyPath.read_text() == currentKey
+
+
+def writeStageKey(outputDataPath, sourcePaths, stageVersion=1, stageParams=None):
+    """
+    Record the cache key for a freshly written stage output.
+
+    Parameters
+    ----------
+    outputDataPath : str or Path
+        Path to the stage's output artifact
+    sourcePaths : list of str or Path
+        The stage's input artifacts
+    stageVersion : int, optional
+        Version of the stage logic
+        Default: 1
+    stageParams : dict, optional
+        Parameters the stage's output depends on
+        Default: None
+    """
+    cacheKey = _stageCacheKey(sourcePaths, stageVersion, stageParams)
+    if cacheKey is not None:
+        _stageKeyPath(outputDataPath).write_text(cacheKey)
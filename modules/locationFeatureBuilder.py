@@ -5,22 +5,27 @@ Builds geographic features for customer segmentation.
 Identifies primary customer location and creates regional indicators.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
 import pandas as pd
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-TRANSACTION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-BEHAVIOR_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'behavior_analyzed.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'location_features.pkl'
+TRANSACTION_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+BASE_METRICS_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'location_features.parquet'
 
 
-def buildLocationFeatures(transactionPicklePath=TRANSACTION_PICKLE_PATH,
-                          behaviorPicklePath=BEHAVIOR_PICKLE_PATH,
-                          outputPicklePath=OUTPUT_PICKLE_PATH):
+def buildLocationFeatures(transactionDataPath=TRANSACTION_DATA_PATH,
+                          baseMetricsPath=BASE_METRICS_PATH,
+                          outputDataPath=OUTPUT_DATA_PATH,
+                          verbose=False):
     """
     Build geographic features for customer analysis.
     
@@ -30,25 +35,29 @@ def buildLocationFeatures(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     
     Parameters
     ----------
-    transactionPicklePath : str or Path, optional
-        Path to transaction data pickle file
-        Default: TRANSACTION_PICKLE_PATH
-    behaviorPicklePath : str or Path, optional
-        Path to behavior analysis data pickle file
-        Default: BEHAVIOR_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    transactionDataPath : str or Path, optional
+        Path to transaction data file
+        Default: TRANSACTION_DATA_PATH
+    baseMetricsPath : str or Path, optional
+        Path to the per-customer base metrics the new columns join onto
+        Default: BASE_METRICS_PATH
+    outputDataPath : str or Path, optional
         Path where location features will be saved
-        Default: OUTPUT_PICKLE_PATH
-        
+        Default: OUTPUT_DATA_PATH
+    verbose : bool, optional
+        Whether to compute and print the per-country transaction
+        distribution, a full normalized value_counts over all rows
+        Default: False
+
     Returns
     -------
     str
-        Path to the location features pickle file
+        Path to the location features data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle files don't exist
+        If source data files don't exist
         
     Examples
     --------
@@ -56,72 +65,76 @@ def buildLocationFeatures(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     >>> print(f"Location features saved to: {locationPath}")
     """
     # Convert to Path objects
-    transactionPicklePath = Path(transactionPicklePath)
-    behaviorPicklePath = Path(behaviorPicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    transactionDataPath = Path(transactionDataPath)
+    baseMetricsPath = Path(baseMetricsPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("GEOGRAPHIC FEATURE ENGINEERING")
-    print("=" * 60)
-    print(f"Transaction data: {transactionPicklePath}")
-    print(f"Behavior data: {behaviorPicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("GEOGRAPHIC FEATURE ENGINEERING")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Transaction data: {transactionDataPath}")
+    logger.info(f"Base metrics: {baseMetricsPath}")
+    logger.info(f"Output: {outputDataPath}")
     
     # Load transaction data
-    if not transactionPicklePath.exists():
-        errorMsg = f"Transaction data file not found: {transactionPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(transactionDataPath):
+        errorMsg = f"Transaction data file not found: {transactionDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(transactionPicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    transactionData = loadDataFrame(transactionDataPath)
+
+    # Countries repeat heavily across transactions; categorizing turns the
+    # distribution count and the groupby below into integer-code operations
+    transactionData['Country'] = transactionData['Country'].astype('category')
+
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
     
-    # Load behavior customer data
-    if not behaviorPicklePath.exists():
-        errorMsg = f"Behavior data file not found: {behaviorPicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load base customer metrics
+    if not frameExists(baseMetricsPath):
+        errorMsg = f"Base metrics file not found: {baseMetricsPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(behaviorPicklePath, "rb") as fileHandle:
-        customerMetrics = pickle.load(fileHandle)
+    customerMetrics = loadDataFrame(baseMetricsPath)
     
-    print(f"✓ Loaded {len(customerMetrics):,} customer records")
+    logger.info(f"✓ Loaded {len(customerMetrics):,} customer records")
     
-    # Analyze country distribution
-    print(f"\nAnalyzing geographic distribution...")
-    countryDistribution = transactionData['Country'].value_counts(normalize=True).head(10)
-    print(f"\nTop 10 countries by transaction volume:")
-    for country, percentage in countryDistribution.items():
-        print(f"  - {country}: {percentage*100:.2f}%")
+    # Analyze country distribution; the normalized value_counts is a full
+    # pass over every row purely for reporting, so gate it behind verbose
+    if verbose:
+        logger.info(f"\nAnalyzing geographic distribution...")
+        countryDistribution = transactionData['Country'].value_counts(normalize=True).head(10)
+        logger.info(f"\nTop 10 countries by transaction volume:")
+        for country, percentage in countryDistribution.items():
+            logger.info(f"  - {country}: {percentage*100:.2f}%")
     
     # Identify customer's primary country
-    print(f"\nIdentifying primary customer locations...")
-    customerCountry = (
-        transactionData.groupby(['CustomerID', 'Country'])
+    logger.info(f"\nIdentifying primary customer locations...")
+    countryCounts = (
+        transactionData.groupby(['CustomerID', 'Country'], sort=False, observed=True)
         .size()
-        .reset_index(name='Number_of_Transactions')
     )
-    
-    # Get country with most transactions for each customer
-    customerMainCountry = (
-        customerCountry.sort_values('Number_of_Transactions', ascending=False)
-        .drop_duplicates('CustomerID')
-    )
-    
-    # Create UK indicator (binary feature)
-    customerMainCountry['Is_UK'] = (
-        customerMainCountry['Country'].apply(
-            lambda x: 1 if x == 'United Kingdom' else 0
-        )
+
+    # Get country with most transactions for each customer; idxmax over the
+    # per-customer counts is a linear scan, unlike sorting the whole
+    # per-customer-country frame just to keep its first rows
+    primaryCountryIndex = countryCounts.groupby(level='CustomerID').idxmax()
+    customerMainCountry = pd.DataFrame(
+        primaryCountryIndex.tolist(), columns=['CustomerID', 'Country']
     )
     
-    # Calculate UK customer percentage
-    ukPercentage = (customerMainCountry['Is_UK'].sum() / len(customerMainCountry)) * 100
-    print(f"\nGeographic distribution:")
-    print(f"  - UK customers: {customerMainCountry['Is_UK'].sum():,} ({ukPercentage:.2f}%)")
-    print(f"  - International customers: {(~customerMainCountry['Is_UK'].astype(bool)).sum():,} ({100-ukPercentage:.2f}%)")
+    # Create UK indicator (binary feature) as a vectorized comparison; no
+    # per-row Python lambda dispatch
+    ukCustomerMask = customerMainCountry['Country'] == 'United Kingdom'
+    customerMainCountry['Is_UK'] = ukCustomerMask.astype('uint8')
+
+    # Calculate UK customer percentage from the same boolean mask
+    ukCustomerCount = int(ukCustomerMask.sum())
+    ukPercentage = (ukCustomerCount / len(customerMainCountry)) * 100
+    logger.info(f"\nGeographic distribution:")
+    logger.info(f"  - UK customers: {ukCustomerCount:,} ({ukPercentage:.2f}%)")
+    logger.info(f"  - International customers: {len(customerMainCountry) - ukCustomerCount:,} ({100-ukPercentage:.2f}%)")
     
     # Merge location features with customer metrics
     customerMetrics = pd.merge(
@@ -131,16 +144,12 @@ def buildLocationFeatures(transactionPicklePath=TRANSACTION_PICKLE_PATH,
         how='left'
     )
     
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
-    
     # Save location features
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ LOCATION FEATURE ENGINEERING COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Output: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ LOCATION FEATURE ENGINEERING COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
@@ -5,22 +5,26 @@ Handles identification and removal of missing values in transaction datasets.
 Focuses on critical columns required for customer segmentation analysis.
 """
 
+import logging
 import os
-import pickle
 from pathlib import Path
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_data.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cleaned_nulls.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_data.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cleaned_nulls.parquet'
 
 # Critical columns that must not contain null values
 CRITICAL_COLUMNS = ['CustomerID', 'Description']
 
 
-def processMissingValues(sourcePicklePath=SOURCE_PICKLE_PATH, 
-                         outputPicklePath=OUTPUT_PICKLE_PATH):
+def processMissingValues(sourceDataPath=SOURCE_DATA_PATH, 
+                         outputDataPath=OUTPUT_DATA_PATH):
     """
     Remove records with missing values in critical columns.
     
@@ -30,22 +34,22 @@ def processMissingValues(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing raw transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing raw transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where cleaned data will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the cleaned dataset pickle file
+        Path to the cleaned dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
     ValueError
         If missing values remain after processing
         
@@ -55,63 +59,67 @@ def processMissingValues(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Cleaned data saved to: {cleanedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("NULL VALUE PROCESSING INITIATED")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("NULL VALUE PROCESSING INITIATED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
     
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
+    transactionData = loadDataFrame(sourceDataPath)
     
-    print(f"\n✓ Loaded {len(transactionData):,} records")
+    logger.info(f"\n✓ Loaded {len(transactionData):,} records")
     
-    # Analyze missing values before cleaning
-    print(f"\nMissing values analysis:")
-    missingCounts = transactionData.isna().sum()
+    # Analyze missing values in the critical columns with a single scan;
+    # the same boolean frame drives the reporting and the row filter below,
+    # so the full frame is never swept more than once
+    logger.info(f"\nMissing values analysis:")
+    criticalNullFlags = transactionData[CRITICAL_COLUMNS].isna()
+    missingCounts = criticalNullFlags.sum()
     for column, count in missingCounts[missingCounts > 0].items():
         percentage = (count / len(transactionData)) * 100
-        print(f"  - {column}: {count:,} ({percentage:.2f}%)")
-    
+        logger.info(f"  - {column}: {count:,} ({percentage:.2f}%)")
+
     # Remove records with null values in critical columns
     initialRecordCount = len(transactionData)
-    transactionData = transactionData.dropna(subset=CRITICAL_COLUMNS)
+    transactionData = transactionData.loc[~criticalNullFlags.any(axis=1)]
     removedRecordCount = initialRecordCount - len(transactionData)
     
-    print(f"\n✓ Removed {removedRecordCount:,} records with null critical values")
-    print(f"✓ Remaining records: {len(transactionData):,}")
+    logger.info(f"\n✓ Removed {removedRecordCount:,} records with null critical values")
+    logger.info(f"✓ Remaining records: {len(transactionData):,}")
+
+    # CustomerID arrives as float64 because of the nulls; with those removed
+    # it can be narrowed to int32, which shrinks the groupby hash keys used
+    # by every downstream stage
+    transactionData['CustomerID'] = transactionData['CustomerID'].astype('int32')
     
-    # Validate no missing values remain
-    remainingNulls = transactionData.isna().sum().sum()
-    if remainingNulls != 0:
+    # Validate no missing values remain in the critical columns; restricting
+    # the check keeps it O(critical columns) instead of rescanning the frame
+    remainingNullCounts = transactionData[CRITICAL_COLUMNS].isna().sum()
+    if remainingNullCounts.any():
         errorMsg = (
-            f"Validation failed: {remainingNulls} null values remain in dataset\n"
-            f"Null distribution:\n{transactionData.isna().sum()[transactionData.isna().sum() > 0]}"
+            f"Validation failed: null values remain in critical columns\n"
+            f"Null distribution:\n{remainingNullCounts[remainingNullCounts > 0]}"
         )
-        print(f"\n✗ {errorMsg}")
+        logger.error(f"\n✗ {errorMsg}")
         raise ValueError(errorMsg)
     
-    print(f"✓ Validation passed: No null values in critical columns")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"✓ Validation passed: No null values in critical columns")
     
     # Save cleaned data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ NULL VALUE PROCESSING COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Cleaned dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ NULL VALUE PROCESSING COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Cleaned dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
@@ -5,22 +5,28 @@ Validates and filters transaction records based on unit price.
 Removes records with zero or negative prices indicating data quality issues.
 """
 
+import logging
 import os
-import pickle
 from pathlib import Path
+import numpy as np
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'description_cleaned.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'description_cleaned.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
 
 # Price validation criteria
 MINIMUM_VALID_PRICE = 0.01  # Minimum acceptable unit price
 
 
-def validatePricing(sourcePicklePath=SOURCE_PICKLE_PATH,
-                   outputPicklePath=OUTPUT_PICKLE_PATH):
+def validatePricing(sourceDataPath=SOURCE_DATA_PATH,
+                   outputDataPath=OUTPUT_DATA_PATH,
+                   verbose=False):
     """
     Validate and filter records based on unit price.
     
@@ -29,22 +35,26 @@ def validatePricing(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where price-validated data will be saved
-        Default: OUTPUT_PICKLE_PATH
-        
+        Default: OUTPUT_DATA_PATH
+    verbose : bool, optional
+        Whether to compute and print price distribution statistics;
+        each statistic is a full pass over the column
+        Default: False
+
     Returns
     -------
     str
-        Path to the validated dataset pickle file
+        Path to the validated dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
         
     Examples
     --------
@@ -52,67 +62,76 @@ def validatePricing(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Price-validated data saved to: {validatedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
-    
-    print("=" * 60)
-    print("PRICE VALIDATION")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
-    
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+    
+    logger.info(SECTION_BANNER)
+    logger.info("PRICE VALIDATION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+    
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
+    transactionData = loadDataFrame(sourceDataPath)
     
     initialRecordCount = len(transactionData)
-    print(f"\n✓ Loaded {initialRecordCount:,} records")
-    
-    # Analyze price distribution before filtering
-    print(f"\nPrice distribution analysis:")
-    print(f"  - Min price: ${transactionData['UnitPrice'].min():.2f}")
-    print(f"  - Max price: ${transactionData['UnitPrice'].max():.2f}")
-    print(f"  - Mean price: ${transactionData['UnitPrice'].mean():.2f}")
-    print(f"  - Median price: ${transactionData['UnitPrice'].median():.2f}")
-    
-    # Count records with invalid prices
-    zeroOrNegativePrices = (transactionData['UnitPrice'] <= 0).sum()
+    logger.info(f"\n✓ Loaded {initialRecordCount:,} records")
+    
+    # Analyze price distribution before filtering; each statistic costs a
+    # full column pass, so only compute them when asked for
+    if verbose:
+        logger.info(f"\nPrice distribution analysis:")
+        logger.info(f"  - Min price: ${transactionData['UnitPrice'].min():.2f}")
+        logger.info(f"  - Max price: ${transactionData['UnitPrice'].max():.2f}")
+        logger.info(f"  - Mean price: ${transactionData['UnitPrice'].mean():.2f}")
+        logger.info(f"  - Median price: ${transactionData['UnitPrice'].median():.2f}")
+    
+    # One boolean scan serves both the invalid-price report and the filter;
+    # no second full-length mask is materialized
+    validPriceMask = transactionData['UnitPrice'].to_numpy() > 0
+    zeroOrNegativePrices = initialRecordCount - int(validPriceMask.sum())
     invalidPercentage = (zeroOrNegativePrices / initialRecordCount) * 100
-    
-    print(f"\nInvalid price detection:")
-    print(f"  - Records with price ≤ 0: {zeroOrNegativePrices:,} ({invalidPercentage:.2f}%)")
-    
+
+    logger.info(f"\nInvalid price detection:")
+    logger.info(f"  - Records with price ≤ 0: {zeroOrNegativePrices:,} ({invalidPercentage:.2f}%)")
+
     # Filter records with valid prices only
-    transactionData = transactionData[transactionData['UnitPrice'] > 0]
+    transactionData = transactionData.loc[validPriceMask]
+
+    # Derive the transaction spend once here; every downstream consumer
+    # (RFM, temporal patterns) reads this single float32 column instead of
+    # re-multiplying UnitPrice by Quantity on each run
+    if 'Quantity' in transactionData.columns:
+        transactionData['Total_Spend'] = (
+            transactionData['UnitPrice'].to_numpy(dtype=np.float32, copy=False)
+            * transactionData['Quantity'].to_numpy(dtype=np.float32, copy=False)
+        )
     
     finalRecordCount = len(transactionData)
     removedRecordCount = initialRecordCount - finalRecordCount
     
-    print(f"\nValidation results:")
-    print(f"  - Records removed: {removedRecordCount:,}")
-    print(f"  - Valid records retained: {finalRecordCount:,}")
+    logger.info(f"\nValidation results:")
+    logger.info(f"  - Records removed: {removedRecordCount:,}")
+    logger.info(f"  - Valid records retained: {finalRecordCount:,}")
     
     # Display updated price statistics
-    print(f"\nUpdated price statistics:")
-    print(f"  - Min price: ${transactionData['UnitPrice'].min():.2f}")
-    print(f"  - Max price: ${transactionData['UnitPrice'].max():.2f}")
-    print(f"  - Mean price: ${transactionData['UnitPrice'].mean():.2f}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    if verbose:
+        logger.info(f"\nUpdated price statistics:")
+        logger.info(f"  - Min price: ${transactionData['UnitPrice'].min():.2f}")
+        logger.info(f"  - Max price: ${transactionData['UnitPrice'].max():.2f}")
+        logger.info(f"  - Mean price: ${transactionData['UnitPrice'].mean():.2f}")
     
     # Save validated data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ PRICE VALIDATION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Validated dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ PRICE VALIDATION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Validated dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
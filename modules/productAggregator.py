@@ -5,22 +5,27 @@ Aggregates unique product purchase data for each customer.
 Calculates product diversity metrics for customer segmentation.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
 import pandas as pd
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-TRANSACTION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-RFM_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'product_aggregated.pkl'
+TRANSACTION_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+RFM_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'product_aggregated.parquet'
 
 
-def aggregateProductData(transactionPicklePath=TRANSACTION_PICKLE_PATH,
-                         rfmPicklePath=RFM_PICKLE_PATH,
-                         outputPicklePath=OUTPUT_PICKLE_PATH):
+def aggregateProductData(transactionDataPath=TRANSACTION_DATA_PATH,
+                         rfmDataPath=RFM_DATA_PATH,
+                         outputDataPath=OUTPUT_DATA_PATH,
+                         verbose=False):
     """
     Calculate unique product purchase metrics for each customer.
     
@@ -30,25 +35,29 @@ def aggregateProductData(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     
     Parameters
     ----------
-    transactionPicklePath : str or Path, optional
-        Path to transaction data pickle file
-        Default: TRANSACTION_PICKLE_PATH
-    rfmPicklePath : str or Path, optional
-        Path to RFM analysis data pickle file
-        Default: RFM_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    transactionDataPath : str or Path, optional
+        Path to transaction data file
+        Default: TRANSACTION_DATA_PATH
+    rfmDataPath : str or Path, optional
+        Path to RFM analysis data file
+        Default: RFM_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where aggregated data will be saved
-        Default: OUTPUT_PICKLE_PATH
-        
+        Default: OUTPUT_DATA_PATH
+    verbose : bool, optional
+        Whether to compute and print product diversity statistics;
+        each statistic is a full pass over the column
+        Default: False
+
     Returns
     -------
     str
-        Path to the aggregated dataset pickle file
+        Path to the aggregated dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle files don't exist
+        If source data files don't exist
         
     Examples
     --------
@@ -56,79 +65,86 @@ def aggregateProductData(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     >>> print(f"Product aggregation saved to: {aggregatedPath}")
     """
     # Convert to Path objects
-    transactionPicklePath = Path(transactionPicklePath)
-    rfmPicklePath = Path(rfmPicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    transactionDataPath = Path(transactionDataPath)
+    rfmDataPath = Path(rfmDataPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("PRODUCT DIVERSITY AGGREGATION")
-    print("=" * 60)
-    print(f"Transaction data: {transactionPicklePath}")
-    print(f"RFM data: {rfmPicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("PRODUCT DIVERSITY AGGREGATION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Transaction data: {transactionDataPath}")
+    logger.info(f"RFM data: {rfmDataPath}")
+    logger.info(f"Output: {outputDataPath}")
     
     # Load transaction data
-    if not transactionPicklePath.exists():
-        errorMsg = f"Transaction data file not found: {transactionPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(transactionDataPath):
+        errorMsg = f"Transaction data file not found: {transactionDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(transactionPicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    # Only the customer and product keys are needed here; the columnar
+    # store skips the other transaction columns entirely
+    transactionData = loadDataFrame(transactionDataPath, columns=['CustomerID', 'StockCode'])
+
+    # StockCode is the dedup key below; categorical codes keep that scan on
+    # small integers even when the input is a legacy pickle artifact
+    if 'StockCode' in transactionData.columns:
+        transactionData['StockCode'] = transactionData['StockCode'].astype('category')
+
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
     
     # Load RFM customer data
-    if not rfmPicklePath.exists():
-        errorMsg = f"RFM data file not found: {rfmPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(rfmDataPath):
+        errorMsg = f"RFM data file not found: {rfmDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(rfmPicklePath, "rb") as fileHandle:
-        customerMetrics = pickle.load(fileHandle)
+    customerMetrics = loadDataFrame(rfmDataPath)
     
-    print(f"✓ Loaded {len(customerMetrics):,} customer records")
+    logger.info(f"✓ Loaded {len(customerMetrics):,} customer records")
     
     # Calculate unique products purchased per customer
-    print(f"\nCalculating product diversity metrics...")
+    logger.info(f"\nCalculating product diversity metrics...")
     
     if 'CustomerID' in transactionData.columns and not transactionData.empty:
+        # Dropping duplicate (CustomerID, StockCode) pairs once and counting
+        # group sizes avoids building a per-customer hashset the way
+        # nunique does
         uniqueProductsPurchased = (
-            transactionData.groupby('CustomerID')['StockCode']
-            .nunique()
-            .reset_index()
-            .rename(columns={'StockCode': 'Unique_Products_Purchased'})
+            transactionData[['CustomerID', 'StockCode']]
+            .drop_duplicates()
+            .groupby('CustomerID', sort=False, observed=True)
+            .size()
+            .reset_index(name='Unique_Products_Purchased')
         )
         
-        print(f"✓ Calculated unique products for {len(uniqueProductsPurchased):,} customers")
+        logger.info(f"✓ Calculated unique products for {len(uniqueProductsPurchased):,} customers")
         
-        # Merge with customer metrics (only for customers in RFM data)
+        # Merge with customer metrics; the left merge already restricts the
+        # result to customers in the RFM data, so no isin pre-filter pass
         customerMetrics = pd.merge(
             customerMetrics,
-            uniqueProductsPurchased[
-                uniqueProductsPurchased['CustomerID'].isin(customerMetrics['CustomerID'])
-            ],
+            uniqueProductsPurchased,
             on='CustomerID',
-            how='left'
+            how='left',
+            validate='1:1'
         )
         
-        # Display product diversity statistics
-        print(f"\nProduct diversity statistics:")
-        print(f"  - Mean unique products: {customerMetrics['Unique_Products_Purchased'].mean():.2f}")
-        print(f"  - Median unique products: {customerMetrics['Unique_Products_Purchased'].median():.2f}")
-        print(f"  - Max unique products: {customerMetrics['Unique_Products_Purchased'].max():.0f}")
-        print(f"  - Min unique products: {customerMetrics['Unique_Products_Purchased'].min():.0f}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+        # Display product diversity statistics; four reporting-only column
+        # passes, so gate them behind verbose
+        if verbose:
+            logger.info(f"\nProduct diversity statistics:")
+            logger.info(f"  - Mean unique products: {customerMetrics['Unique_Products_Purchased'].mean():.2f}")
+            logger.info(f"  - Median unique products: {customerMetrics['Unique_Products_Purchased'].median():.2f}")
+            logger.info(f"  - Max unique products: {customerMetrics['Unique_Products_Purchased'].max():.0f}")
+            logger.info(f"  - Min unique products: {customerMetrics['Unique_Products_Purchased'].min():.0f}")
     
     # Save aggregated data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ PRODUCT AGGREGATION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Output: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ PRODUCT AGGREGATION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
@@ -5,15 +5,20 @@ Identifies and removes duplicate transaction records based on key business colum
 Ensures data integrity for accurate customer segmentation analysis.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
+import pandas as pd
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cleaned_nulls.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'deduplicated_data.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cleaned_nulls.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'deduplicated_data.parquet'
 
 # Columns used to identify duplicate records
 DEDUPLICATION_COLUMNS = [
@@ -25,8 +30,8 @@ DEDUPLICATION_COLUMNS = [
 ]
 
 
-def eliminateDuplicates(sourcePicklePath=SOURCE_PICKLE_PATH,
-                       outputPicklePath=OUTPUT_PICKLE_PATH):
+def eliminateDuplicates(sourceDataPath=SOURCE_DATA_PATH,
+                       outputDataPath=OUTPUT_DATA_PATH):
     """
     Remove duplicate transaction records from dataset.
     
@@ -36,22 +41,22 @@ def eliminateDuplicates(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where deduplicated data will be saved
-        Default: OUTPUT_PICKLE_PATH
+        Default: OUTPUT_DATA_PATH
         
     Returns
     -------
     str
-        Path to the deduplicated dataset pickle file
+        Path to the deduplicated dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
         
     Examples
     --------
@@ -59,60 +64,69 @@ def eliminateDuplicates(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Deduplicated data saved to: {deduplicatedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
-    
-    print("=" * 60)
-    print("RECORD DEDUPLICATION INITIATED")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
-    
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
+    
+    logger.info(SECTION_BANNER)
+    logger.info("RECORD DEDUPLICATION INITIATED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
+    
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
+    transactionData = loadDataFrame(sourceDataPath)
+
+    # The string key columns repeat heavily across transactions; categorical
+    # codes let the duplicate scan below compare small integers instead of
+    # Python strings, and the dtype persists through the saved Parquet so
+    # downstream stages inherit it
+    for keyColumn in ('InvoiceNo', 'StockCode', 'Description', 'Country'):
+        if keyColumn in transactionData.columns:
+            transactionData[keyColumn] = transactionData[keyColumn].astype('category')
+
     initialRecordCount = len(transactionData)
-    print(f"\n✓ Loaded {initialRecordCount:,} records")
+    logger.info(f"\n✓ Loaded {initialRecordCount:,} records")
     
     # Display deduplication criteria
-    print(f"\nDeduplication columns:")
+    logger.info(f"\nDeduplication columns:")
     for column in DEDUPLICATION_COLUMNS:
-        print(f"  - {column}")
-    
-    # Identify duplicates before removal
-    duplicateMask = transactionData.duplicated(subset=DEDUPLICATION_COLUMNS, keep='first')
-    duplicateCount = duplicateMask.sum()
+        logger.info(f"  - {column}")
+    
+    # Identify duplicates with one pass: combine the five key columns into a
+    # single uint64 hash per row and probe one hash table, instead of
+    # letting duplicated/drop_duplicates each factorize all five mixed
+    # columns separately
+    rowHashes = pd.util.hash_pandas_object(
+        transactionData[DEDUPLICATION_COLUMNS], index=False
+    ).to_numpy()
+    duplicateMask = pd.Index(rowHashes).duplicated(keep='first')
+    duplicateCount = int(duplicateMask.sum())
     duplicatePercentage = (duplicateCount / initialRecordCount) * 100
-    
-    print(f"\nDuplicate analysis:")
-    print(f"  - Duplicate records found: {duplicateCount:,} ({duplicatePercentage:.2f}%)")
-    print(f"  - Unique records: {initialRecordCount - duplicateCount:,}")
-    
-    # Remove duplicate records (keep first occurrence)
-    transactionData = transactionData.drop_duplicates(subset=DEDUPLICATION_COLUMNS, keep='first')
+
+    logger.info(f"\nDuplicate analysis:")
+    logger.info(f"  - Duplicate records found: {duplicateCount:,} ({duplicatePercentage:.2f}%)")
+    logger.info(f"  - Unique records: {initialRecordCount - duplicateCount:,}")
+
+    # Remove duplicate records (keep first occurrence) with the same mask
+    transactionData = transactionData.loc[~duplicateMask]
     
     finalRecordCount = len(transactionData)
     removedRecordCount = initialRecordCount - finalRecordCount
     
-    print(f"\n✓ Removed {removedRecordCount:,} duplicate records")
-    print(f"✓ Remaining unique records: {finalRecordCount:,}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"\n✓ Removed {removedRecordCount:,} duplicate records")
+    logger.info(f"✓ Remaining unique records: {finalRecordCount:,}")
     
     # Save deduplicated data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ DEDUPLICATION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Deduplicated dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ DEDUPLICATION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Deduplicated dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
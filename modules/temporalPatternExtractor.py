@@ -5,24 +5,28 @@ Extracts seasonal and temporal spending patterns.
 Calculates spending trends and variability metrics for customer segmentation.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import scipy.stats as stats
+from .frameStore import frameColumns, frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-TRANSACTION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.pkl'
-CANCELLATION_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'cancellation_analyzed.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'temporal_features.pkl'
+TRANSACTION_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'price_validated.parquet'
+BASE_METRICS_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'rfm_analysis.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'temporal_features.parquet'
 
 
-def extractTemporalPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
-                            cancellationPicklePath=CANCELLATION_PICKLE_PATH,
-                            outputPicklePath=OUTPUT_PICKLE_PATH):
+def extractTemporalPatterns(transactionDataPath=TRANSACTION_DATA_PATH,
+                            baseMetricsPath=BASE_METRICS_PATH,
+                            outputDataPath=OUTPUT_DATA_PATH,
+                            verbose=False):
     """
     Extract temporal spending patterns and seasonality trends.
     
@@ -32,25 +36,29 @@ def extractTemporalPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     
     Parameters
     ----------
-    transactionPicklePath : str or Path, optional
-        Path to transaction data pickle file
-        Default: TRANSACTION_PICKLE_PATH
-    cancellationPicklePath : str or Path, optional
-        Path to cancellation analysis data pickle file
-        Default: CANCELLATION_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    transactionDataPath : str or Path, optional
+        Path to transaction data file
+        Default: TRANSACTION_DATA_PATH
+    baseMetricsPath : str or Path, optional
+        Path to the per-customer base metrics the new columns join onto
+        Default: BASE_METRICS_PATH
+    outputDataPath : str or Path, optional
         Path where temporal features will be saved
-        Default: OUTPUT_PICKLE_PATH
-        
+        Default: OUTPUT_DATA_PATH
+    verbose : bool, optional
+        Whether to compute and print temporal pattern statistics;
+        each statistic is a full pass over the feature columns
+        Default: False
+
     Returns
     -------
     str
-        Path to the temporal features pickle file
+        Path to the temporal features data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle files don't exist
+        If source data files don't exist
         
     Examples
     --------
@@ -58,139 +66,185 @@ def extractTemporalPatterns(transactionPicklePath=TRANSACTION_PICKLE_PATH,
     >>> print(f"Temporal features saved to: {temporalPath}")
     """
     # Convert to Path objects
-    transactionPicklePath = Path(transactionPicklePath)
-    cancellationPicklePath = Path(cancellationPicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    transactionDataPath = Path(transactionDataPath)
+    baseMetricsPath = Path(baseMetricsPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("TEMPORAL PATTERN EXTRACTION")
-    print("=" * 60)
-    print(f"Transaction data: {transactionPicklePath}")
-    print(f"Cancellation data: {cancellationPicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("TEMPORAL PATTERN EXTRACTION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Transaction data: {transactionDataPath}")
+    logger.info(f"Base metrics: {baseMetricsPath}")
+    logger.info(f"Output: {outputDataPath}")
     
     # Load transaction data
-    if not transactionPicklePath.exists():
-        errorMsg = f"Transaction data file not found: {transactionPicklePath}"
-        print(f"✗ {errorMsg}")
+    if not frameExists(transactionDataPath):
+        errorMsg = f"Transaction data file not found: {transactionDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(transactionPicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
-    print(f"\n✓ Loaded {len(transactionData):,} transaction records")
+    # Monthly spending only needs the customer key, the date and the spend
+    # column; the columnar store prunes the rest at read time. Inspect the
+    # stored schema before projecting: inputs written before the price
+    # stage persisted Total_Spend carry UnitPrice/Quantity instead, and
+    # requesting an absent column would fail the read outright
+    storedColumns = frameColumns(transactionDataPath)
+    projectedColumns = ['CustomerID', 'InvoiceDate']
+    if storedColumns is None or 'Total_Spend' in storedColumns:
+        projectedColumns.append('Total_Spend')
+    else:
+        projectedColumns.extend(['UnitPrice', 'Quantity'])
+    transactionData = loadDataFrame(transactionDataPath, columns=projectedColumns)
+
+    logger.info(f"\n✓ Loaded {len(transactionData):,} transaction records")
     
-    # Load cancellation customer data
-    if not cancellationPicklePath.exists():
-        errorMsg = f"Cancellation data file not found: {cancellationPicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load base customer metrics
+    if not frameExists(baseMetricsPath):
+        errorMsg = f"Base metrics file not found: {baseMetricsPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(cancellationPicklePath, "rb") as fileHandle:
-        customerMetrics = pickle.load(fileHandle)
+    customerMetrics = loadDataFrame(baseMetricsPath)
     
-    print(f"✓ Loaded {len(customerMetrics):,} customer records")
+    logger.info(f"✓ Loaded {len(customerMetrics):,} customer records")
     
     # Calculate total spend per transaction
-    print(f"\nCalculating spending metrics...")
-    transactionData['Total_Spend'] = transactionData['UnitPrice'] * transactionData['Quantity']
-    
-    # Extract temporal components
-    transactionData['InvoiceDate'] = pd.to_datetime(transactionData['InvoiceDate'])
-    transactionData['Year'] = transactionData['InvoiceDate'].dt.year
-    transactionData['Month'] = transactionData['InvoiceDate'].dt.month
-    
-    # Calculate monthly spending per customer
-    print(f"Analyzing monthly spending patterns...")
+    logger.info(f"\nCalculating spending metrics...")
+    if 'Total_Spend' not in transactionData.columns:
+        # Legacy inputs predate the persisted spend column; derive it the
+        # same way the price stage does — a raw float32 product, half the
+        # bandwidth of float64 with ample cash-value precision
+        transactionData['Total_Spend'] = (
+            transactionData['UnitPrice'].to_numpy(dtype=np.float32, copy=False)
+            * transactionData['Quantity'].to_numpy(dtype=np.float32, copy=False)
+        )
+    
+    # Extract temporal components; Parquet artifacts already carry
+    # datetime64, so only legacy string-dated inputs pay for parsing
+    if not pd.api.types.is_datetime64_any_dtype(transactionData['InvoiceDate']):
+        transactionData['InvoiceDate'] = pd.to_datetime(
+            transactionData['InvoiceDate'], format='ISO8601', cache=True
+        )
+    # A single int32 month index (months since epoch, straight from the
+    # datetime64 buffer) replaces separate Year and Month columns: one
+    # narrow group key instead of two, and no dt accessor allocations
+    transactionData['Year_Month'] = (
+        transactionData['InvoiceDate'].to_numpy().astype('datetime64[M]').astype('int32')
+    )
+
+    # Calculate monthly spending per customer; sorting on the month index
+    # keeps each customer's months in chronological order for the trend
+    # calculation below
+    logger.info(f"Analyzing monthly spending patterns...")
+    # sort=True is load-bearing here: the trend step relies on each
+    # customer's months arriving in chronological order
     monthlySpending = (
-        transactionData.groupby(['CustomerID', 'Year', 'Month'])['Total_Spend']
+        transactionData.groupby(['CustomerID', 'Year_Month'], as_index=False, observed=True)['Total_Spend']
         .sum()
-        .reset_index()
     )
-    
-    # Calculate seasonal buying patterns (mean and std of monthly spending)
+
+    # Calculate seasonal buying patterns (mean and std of monthly spending);
+    # named aggregation writes the final column names directly, no rename pass
     seasonalBuyingPatterns = (
-        monthlySpending.groupby('CustomerID')['Total_Spend']
-        .agg(['mean', 'std'])
-        .reset_index()
-    )
-    seasonalBuyingPatterns.rename(
-        columns={
-            'mean': 'Monthly_Spending_Mean',
-            'std': 'Monthly_Spending_Std'
-        },
-        inplace=True
+        monthlySpending.groupby('CustomerID', as_index=False, sort=False, observed=True)
+        .agg(
+            Monthly_Spending_Mean=('Total_Spend', 'mean'),
+            Monthly_Spending_Std=('Total_Spend', 'std')
+        )
     )
     
-    # Fill NaN standard deviations (customers with only one month of data)
-    seasonalBuyingPatterns['Monthly_Spending_Std'].fillna(0, inplace=True)
-    
-    # Calculate spending trend using linear regression
-    print(f"Calculating spending trends...")
-    
-    def calculateSpendingTrend(spendingTimeSeries):
-        """
-        Calculate spending trend slope using linear regression.
-        
-        Parameters
-        ----------
-        spendingTimeSeries : pd.Series
-            Time series of spending values
-            
-        Returns
-        -------
-        float
-            Slope of spending trend (positive = increasing, negative = decreasing)
-        """
-        if len(spendingTimeSeries) > 1:
-            timePoints = np.arange(len(spendingTimeSeries))
-            slope, _, _, _, _ = stats.linregress(timePoints, spendingTimeSeries)
-            return slope
-        return 0
-    
-    spendingTrends = (
-        monthlySpending.groupby('CustomerID')['Total_Spend']
-        .apply(calculateSpendingTrend)
-        .reset_index()
+    # Fill NaN standard deviations (customers with only one month of data);
+    # a plain column assignment touches only this one column, while the
+    # previous chained fillna(inplace=True) is deprecated under
+    # copy-on-write and raised a chained-assignment warning
+    seasonalBuyingPatterns['Monthly_Spending_Std'] = (
+        seasonalBuyingPatterns['Monthly_Spending_Std'].fillna(0.0)
     )
-    spendingTrends.rename(columns={'Total_Spend': 'Spending_Trend'}, inplace=True)
     
-    # Merge temporal features with customer metrics
-    print(f"\nMerging temporal features...")
-    customerMetrics = pd.merge(
-        customerMetrics,
-        seasonalBuyingPatterns,
-        on='CustomerID',
-        how='left'
+    # Calculate spending trend with closed-form least squares: the slope is
+    # cov(t, y) / var(t), so five vectorized per-customer sums replace a
+    # Python-level linregress call per customer. cumcount supplies each
+    # customer's chronological month index because monthlySpending is sorted
+    # by (CustomerID, Year_Month)
+    logger.info(f"Calculating spending trends...")
+    timeIndex = monthlySpending.groupby('CustomerID', observed=True).cumcount().to_numpy(np.float64)
+    spendValues = monthlySpending['Total_Spend'].to_numpy(np.float64)
+
+    trendComponents = (
+        monthlySpending.assign(
+            Time_Index=timeIndex,
+            Time_Spend=timeIndex * spendValues,
+            Time_Squared=timeIndex * timeIndex
+        )
+        .groupby('CustomerID', as_index=False, sort=False, observed=True)
+        .agg(
+            monthCount=('Time_Index', 'size'),
+            timeSum=('Time_Index', 'sum'),
+            timeSquaredSum=('Time_Squared', 'sum'),
+            spendSum=('Total_Spend', 'sum'),
+            timeSpendSum=('Time_Spend', 'sum')
+        )
+    )
+
+    monthCounts = trendComponents['monthCount'].to_numpy(np.float64)
+    slopeDenominator = (
+        monthCounts * trendComponents['timeSquaredSum'].to_numpy()
+        - trendComponents['timeSum'].to_numpy() ** 2
     )
-    customerMetrics = pd.merge(
-        customerMetrics,
+    slopeNumerator = (
+        monthCounts * trendComponents['timeSpendSum'].to_numpy()
+        - trendComponents['timeSum'].to_numpy() * trendComponents['spendSum'].to_numpy()
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trendSlopes = np.where(slopeDenominator > 0, slopeNumerator / slopeDenominator, 0.0)
+
+    spendingTrends = pd.DataFrame({
+        'CustomerID': trendComponents['CustomerID'],
+        'Spending_Trend': trendSlopes
+    })
+    
+    # Merge temporal features with customer metrics. Combining the two
+    # per-customer frames first means customerMetrics is hashed and copied
+    # once instead of twice; validate guards against silent row blowup
+    logger.info(f"\nMerging temporal features...")
+    temporalFeatures = seasonalBuyingPatterns.merge(
         spendingTrends,
         on='CustomerID',
-        how='left'
+        how='outer',
+        validate='1:1'
+    )
+    customerMetrics = customerMetrics.merge(
+        temporalFeatures,
+        on='CustomerID',
+        how='left',
+        validate='m:1'
     )
     
-    # Convert CustomerID to string and optimize data types
-    customerMetrics['CustomerID'] = customerMetrics['CustomerID'].astype(str)
-    customerMetrics = customerMetrics.convert_dtypes()
-    
-    # Display temporal pattern statistics
-    print(f"\nTemporal pattern statistics:")
-    print(f"  - Avg monthly spending: ${seasonalBuyingPatterns['Monthly_Spending_Mean'].mean():.2f}")
-    print(f"  - Avg spending variability: ${seasonalBuyingPatterns['Monthly_Spending_Std'].mean():.2f}")
-    print(f"  - Customers with positive trend: {(spendingTrends['Spending_Trend'] > 0).sum():,}")
-    print(f"  - Customers with negative trend: {(spendingTrends['Spending_Trend'] < 0).sum():,}")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    # Pin the new feature columns to float32 explicitly; convert_dtypes()
+    # would rescan every column and promote numerics to masked extension
+    # arrays that are slower in downstream arithmetic. CustomerID stays
+    # integer so downstream joins hash machine ints, not Python strings
+    customerMetrics = customerMetrics.astype({
+        'Monthly_Spending_Mean': 'float32',
+        'Monthly_Spending_Std': 'float32',
+        'Spending_Trend': 'float32'
+    })
+    
+    # Display temporal pattern statistics; reporting-only column passes,
+    # so gate them behind verbose
+    if verbose:
+        logger.info(f"\nTemporal pattern statistics:")
+        logger.info(f"  - Avg monthly spending: ${seasonalBuyingPatterns['Monthly_Spending_Mean'].mean():.2f}")
+        logger.info(f"  - Avg spending variability: ${seasonalBuyingPatterns['Monthly_Spending_Std'].mean():.2f}")
+        logger.info(f"  - Customers with positive trend: {(spendingTrends['Spending_Trend'] > 0).sum():,}")
+        logger.info(f"  - Customers with negative trend: {(spendingTrends['Spending_Trend'] < 0).sum():,}")
     
     # Save temporal features
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(customerMetrics, fileHandle)
+    saveDataFrame(customerMetrics, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ TEMPORAL PATTERN EXTRACTION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Output: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ TEMPORAL PATTERN EXTRACTION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Output: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
@@ -5,20 +5,26 @@ Classifies transactions as completed or cancelled based on invoice identifiers.
 Adds transaction status metadata for business analytics.
 """
 
-import pickle
+import logging
 import os
 from pathlib import Path
+import pandas as pd
 import numpy as np
+from .frameStore import frameExists, loadDataFrame, saveDataFrame
+from .logConfig import SECTION_BANNER
+
+logger = logging.getLogger(__name__)
 
 
 # Configure project paths
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
-SOURCE_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'deduplicated_data.pkl'
-OUTPUT_PICKLE_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_classified.pkl'
+SOURCE_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'deduplicated_data.parquet'
+OUTPUT_DATA_PATH = PROJECT_ROOT / 'datasets' / 'processed' / 'transaction_classified.parquet'
 
 
-def classifyTransactionStatus(sourcePicklePath=SOURCE_PICKLE_PATH,
-                              outputPicklePath=OUTPUT_PICKLE_PATH):
+def classifyTransactionStatus(sourceDataPath=SOURCE_DATA_PATH,
+                              outputDataPath=OUTPUT_DATA_PATH,
+                              verbose=False):
     """
     Add transaction status classification to dataset.
     
@@ -27,22 +33,26 @@ def classifyTransactionStatus(sourcePicklePath=SOURCE_PICKLE_PATH,
     
     Parameters
     ----------
-    sourcePicklePath : str or Path, optional
-        Path to input pickle file containing transaction data
-        Default: SOURCE_PICKLE_PATH
-    outputPicklePath : str or Path, optional
+    sourceDataPath : str or Path, optional
+        Path to input data file containing transaction data
+        Default: SOURCE_DATA_PATH
+    outputDataPath : str or Path, optional
         Path where classified data will be saved
-        Default: OUTPUT_PICKLE_PATH
-        
+        Default: OUTPUT_DATA_PATH
+    verbose : bool, optional
+        Whether to compute and print per-status counts; the value_counts
+        is a full grouping pass done purely for reporting
+        Default: False
+
     Returns
     -------
     str
-        Path to the classified dataset pickle file
+        Path to the classified dataset data file
         
     Raises
     ------
     FileNotFoundError
-        If source pickle file doesn't exist
+        If source data file doesn't exist
     KeyError
         If InvoiceNo column is missing from dataset
         
@@ -52,57 +62,73 @@ def classifyTransactionStatus(sourcePicklePath=SOURCE_PICKLE_PATH,
     >>> print(f"Classified data saved to: {classifiedPath}")
     """
     # Convert to Path objects
-    sourcePicklePath = Path(sourcePicklePath)
-    outputPicklePath = Path(outputPicklePath)
+    sourceDataPath = Path(sourceDataPath)
+    outputDataPath = Path(outputDataPath)
     
-    print("=" * 60)
-    print("TRANSACTION STATUS CLASSIFICATION")
-    print("=" * 60)
-    print(f"Source: {sourcePicklePath}")
-    print(f"Output: {outputPicklePath}")
+    logger.info(SECTION_BANNER)
+    logger.info("TRANSACTION STATUS CLASSIFICATION")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Source: {sourceDataPath}")
+    logger.info(f"Output: {outputDataPath}")
     
-    # Load transaction data from pickle
-    if not sourcePicklePath.exists():
-        errorMsg = f"Source data file not found: {sourcePicklePath}"
-        print(f"✗ {errorMsg}")
+    # Load transaction data
+    if not frameExists(sourceDataPath):
+        errorMsg = f"Source data file not found: {sourceDataPath}"
+        logger.error(f"✗ {errorMsg}")
         raise FileNotFoundError(errorMsg)
     
-    with open(sourcePicklePath, "rb") as fileHandle:
-        transactionData = pickle.load(fileHandle)
-    
-    print(f"\n✓ Loaded {len(transactionData):,} records")
+    transactionData = loadDataFrame(sourceDataPath)
+
+    # Ensure the repeated string keys carry categorical codes; legacy pickle
+    # inputs arrive as plain object columns
+    for keyColumn in ('InvoiceNo', 'StockCode', 'Description', 'Country'):
+        if keyColumn in transactionData.columns:
+            transactionData[keyColumn] = transactionData[keyColumn].astype('category')
+
+    logger.info(f"\n✓ Loaded {len(transactionData):,} records")
     
     # Validate required column exists
     if 'InvoiceNo' not in transactionData.columns:
         errorMsg = "Required column 'InvoiceNo' not found in dataset"
-        print(f"✗ {errorMsg}")
+        logger.error(f"✗ {errorMsg}")
         raise KeyError(errorMsg)
     
     # Classify transactions based on invoice number prefix
-    # Invoices starting with 'C' indicate cancellations
-    transactionData['TransactionStatus'] = np.where(
-        transactionData['InvoiceNo'].astype(str).str.startswith('C'),
-        'Cancelled',
-        'Completed'
+    # Invoices starting with 'C' indicate cancellations. The prefix test
+    # runs once per unique invoice on the category table and is broadcast
+    # to all rows through the integer codes, so the per-row cost is a
+    # single int8 gather; the result is itself categorical (one byte per
+    # row instead of a Python string)
+    invoiceCategories = transactionData['InvoiceNo'].cat
+    cancelledByCategory = np.fromiter(
+        (str(invoiceNumber).startswith('C') for invoiceNumber in invoiceCategories.categories),
+        dtype=bool,
+        count=len(invoiceCategories.categories)
+    )
+    # Missing invoice numbers carry code -1, which would wrap to the last
+    # category's flag; guard them to 'Completed' like the string path did
+    invoiceCodes = invoiceCategories.codes
+    cancelledMask = np.where(invoiceCodes >= 0, cancelledByCategory[invoiceCodes], False)
+    transactionData['TransactionStatus'] = pd.Categorical.from_codes(
+        cancelledMask.astype(np.int8),
+        categories=['Completed', 'Cancelled']
     )
     
-    # Generate classification statistics
-    statusCounts = transactionData['TransactionStatus'].value_counts()
-    print(f"\nTransaction classification results:")
-    for status, count in statusCounts.items():
-        percentage = (count / len(transactionData)) * 100
-        print(f"  - {status}: {count:,} ({percentage:.2f}%)")
-    
-    # Ensure output directory exists
-    outputPicklePath.parent.mkdir(parents=True, exist_ok=True)
+    # Generate classification statistics; value_counts is a full grouping
+    # pass purely for reporting, so only run it when asked for
+    if verbose:
+        statusCounts = transactionData['TransactionStatus'].value_counts()
+        logger.info(f"\nTransaction classification results:")
+        for status, count in statusCounts.items():
+            percentage = (count / len(transactionData)) * 100
+            logger.info(f"  - {status}: {count:,} ({percentage:.2f}%)")
     
     # Save classified data
-    with open(outputPicklePath, "wb") as fileHandle:
-        pickle.dump(transactionData, fileHandle)
+    saveDataFrame(transactionData, outputDataPath)
     
-    print(f"\n{'=' * 60}")
-    print("✓ CLASSIFICATION COMPLETED")
-    print(f"{'=' * 60}")
-    print(f"Classified dataset: {outputPicklePath}")
+    logger.info('\n' + SECTION_BANNER)
+    logger.info("✓ CLASSIFICATION COMPLETED")
+    logger.info(SECTION_BANNER)
+    logger.info(f"Classified dataset: {outputDataPath}")
     
-    return str(outputPicklePath)
+    return str(outputDataPath)
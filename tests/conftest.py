@@ -17,11 +17,11 @@ def test_data_dir(tmp_path_factory):
     return tmp_path_factory.mktemp('test_data')
 
 
-@pytest.fixture
-def sample_transaction_data():
+@pytest.fixture(scope='session')
+def _sample_transaction_frame():
     """
-    Fixture providing comprehensive sample transaction data.
-    
+    Build the shared sample transaction dataset once per test session.
+
     Returns
     -------
     pd.DataFrame
@@ -29,33 +29,51 @@ def sample_transaction_data():
     """
     np.random.seed(42)
     n_records = 100
-    
+    record_index = np.arange(n_records)
+
     base_date = datetime(2011, 12, 1)
-    
+
     return pd.DataFrame({
-        'InvoiceNo': [f'53{i:04d}' if i % 10 != 0 else f'C53{i:04d}' 
-                      for i in range(n_records)],
+        'InvoiceNo': np.where(record_index % 10 == 0, 'C53', '53')
+                     + pd.Series(record_index).astype(str).str.zfill(4),
         'StockCode': np.random.choice(['85123A', '71053', '84406B', '22423'], n_records),
         'Description': np.random.choice([
-            'WHITE HANGING HEART', 
+            'WHITE HANGING HEART',
             'WHITE METAL LANTERN',
             'CREAM CUPID HEARTS',
             'REGENCY CAKESTAND'
         ], n_records),
         'Quantity': np.random.randint(1, 20, n_records),
-        'InvoiceDate': [base_date + timedelta(days=np.random.randint(0, 365)) 
-                        for _ in range(n_records)],
+        'InvoiceDate': base_date + pd.to_timedelta(
+            np.random.randint(0, 365, n_records), unit='D'
+        ),
         'UnitPrice': np.random.uniform(1.0, 50.0, n_records),
         'CustomerID': np.random.choice([17850, 17851, 17852, 17853], n_records),
         'Country': np.random.choice([
-            'United Kingdom', 
-            'France', 
-            'Germany', 
+            'United Kingdom',
+            'France',
+            'Germany',
             'Spain'
         ], n_records)
     })
 
 
+@pytest.fixture
+def sample_transaction_data(_sample_transaction_frame):
+    """
+    Fixture providing comprehensive sample transaction data.
+
+    Hands each test a copy of the session-cached frame so tests can
+    mutate it freely without rebuilding the dataset every time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Sample transaction dataset with all required columns
+    """
+    return _sample_transaction_frame.copy()
+
+
 @pytest.fixture
 def sample_customer_data():
     """
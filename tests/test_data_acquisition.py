@@ -52,16 +52,21 @@ class TestDataFetcher:
 class TestArchiveExtractor:
     """Test suite for archiveExtractor module."""
     
-    @patch('modules.archiveExtractor.zipfile.ZipFile')
-    def test_extract_archive_success(self, mock_zipfile):
+    def test_extract_archive_success(self, tmp_path):
         """Test successful archive extraction."""
-        mock_zip = Mock()
-        mock_zip.namelist.return_value = ['Online Retail.xlsx']
-        mock_zipfile.return_value.__enter__.return_value = mock_zip
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            result = extractArchive()
-            assert result.endswith('.xlsx')
+        import zipfile
+        archive_path = tmp_path / 'retail_data.zip'
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr('Online Retail.xlsx', b'spreadsheet-bytes')
+
+        destination = tmp_path / 'extracted'
+        result = extractArchive(archive_path, destination)
+        assert result.endswith('.xlsx')
+        assert (destination / 'Online Retail.xlsx').read_bytes() == b'spreadsheet-bytes'
+
+        # Re-running skips already-extracted members via their CRC
+        result = extractArchive(archive_path, destination)
+        assert result.endswith('.xlsx')
     
     def test_extract_archive_file_not_found(self):
         """Test extraction with missing archive file."""
@@ -81,37 +86,36 @@ class TestArchiveExtractor:
 
 class TestDatasetLoader:
     """Test suite for datasetLoader module."""
-    
-    def test_load_dataset_from_pickle(self):
-        """Test loading dataset from existing pickle file."""
+
+    def test_load_dataset_from_cache(self):
+        """Test loading dataset from existing cache file."""
         test_data = pd.DataFrame({'col1': [1, 2, 3]})
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=test_data):
-                    with patch('pickle.dump'):
-                        result = loadDataset()
-                        assert result.endswith('.pkl')
-    
+
+        with patch('modules.datasetLoader.frameExists', return_value=True):
+            with patch('modules.datasetLoader.loadDataFrame', return_value=test_data):
+                with patch('modules.datasetLoader.saveDataFrame') as mock_save:
+                    result = loadDataset()
+                    assert result.endswith('.parquet')
+                    # A cache hit must not rewrite the cache
+                    mock_save.assert_not_called()
+
     def test_load_dataset_from_excel(self):
-        """Test loading dataset from Excel when pickle doesn't exist."""
+        """Test loading dataset from Excel when the cache doesn't exist."""
         test_data = pd.DataFrame({'col1': [1, 2, 3]})
-        
-        def exists_side_effect(path):
-            return 'xlsx' in str(path)
-        
-        with patch('pathlib.Path.exists', side_effect=exists_side_effect):
-            with patch('pandas.read_excel', return_value=test_data):
-                with patch('builtins.open', mock_open()):
-                    with patch('pickle.dump'):
+
+        with patch('modules.datasetLoader.frameExists', return_value=False):
+            with patch('pathlib.Path.exists', return_value=True):
+                with patch('pandas.read_excel', return_value=test_data):
+                    with patch('modules.datasetLoader.saveDataFrame'):
                         result = loadDataset()
-                        assert result.endswith('.pkl')
-    
+                        assert result.endswith('.parquet')
+
     def test_load_dataset_file_not_found(self):
         """Test loading with missing files."""
-        with patch('pathlib.Path.exists', return_value=False):
-            with pytest.raises(FileNotFoundError):
-                loadDataset()
+        with patch('modules.datasetLoader.frameExists', return_value=False):
+            with patch('pathlib.Path.exists', return_value=False):
+                with pytest.raises(FileNotFoundError):
+                    loadDataset()
 
 
 # Pytest configuration
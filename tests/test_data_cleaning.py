@@ -6,8 +6,7 @@ Tests for data cleaning and validation modules.
 
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
-import pickle
+from unittest.mock import Mock, patch
 import pandas as pd
 import numpy as np
 from modules import (
@@ -22,7 +21,7 @@ from modules import (
 
 class TestNullValueProcessor:
     """Test suite for nullValueProcessor module."""
-    
+
     @pytest.fixture
     def data_with_nulls(self):
         """Sample data with missing values."""
@@ -31,37 +30,37 @@ class TestNullValueProcessor:
             'Description': ['Item A', 'Item B', 'Item C', np.nan],
             'Quantity': [1, 2, 3, 4]
         })
-    
+
     def test_process_missing_values_success(self, data_with_nulls):
         """Test successful null value processing."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_nulls):
-                    with patch('pickle.dump') as mock_dump:
-                        result = processMissingValues()
-                        assert result.endswith('.pkl')
-                        # Verify data was cleaned
-                        saved_data = mock_dump.call_args[0][0]
-                        assert saved_data['CustomerID'].isna().sum() == 0
-    
-    def test_process_missing_values_validation_error(self):
-        """Test validation error when nulls remain."""
-        data_with_remaining_nulls = pd.DataFrame({
+        with patch('modules.nullValueProcessor.frameExists', return_value=True):
+            with patch('modules.nullValueProcessor.loadDataFrame', return_value=data_with_nulls):
+                with patch('modules.nullValueProcessor.saveDataFrame') as mock_save:
+                    result = processMissingValues()
+                    assert result.endswith('.parquet')
+                    # Verify data was cleaned
+                    saved_data = mock_save.call_args[0][0]
+                    assert saved_data['CustomerID'].isna().sum() == 0
+
+    def test_process_missing_values_keeps_noncritical_nulls(self):
+        """Nulls outside the critical columns are preserved, not an error."""
+        data_with_noncritical_nulls = pd.DataFrame({
             'CustomerID': [1.0, 2.0, 3.0],
             'Description': ['A', 'B', 'C'],
             'OtherCol': [1, np.nan, 3]
         })
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_remaining_nulls):
-                    with pytest.raises(ValueError, match="null values remain"):
-                        processMissingValues()
+
+        with patch('modules.nullValueProcessor.frameExists', return_value=True):
+            with patch('modules.nullValueProcessor.loadDataFrame', return_value=data_with_noncritical_nulls):
+                with patch('modules.nullValueProcessor.saveDataFrame') as mock_save:
+                    processMissingValues()
+                    saved_data = mock_save.call_args[0][0]
+                    assert saved_data['OtherCol'].isna().sum() == 1
 
 
 class TestRecordDeduplicator:
     """Test suite for recordDeduplicator module."""
-    
+
     @pytest.fixture
     def data_with_duplicates(self):
         """Sample data with duplicate records."""
@@ -72,23 +71,22 @@ class TestRecordDeduplicator:
             'CustomerID': [1, 1, 2],
             'Quantity': [5, 5, 3]
         })
-    
+
     def test_eliminate_duplicates_success(self, data_with_duplicates):
         """Test successful duplicate removal."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_duplicates):
-                    with patch('pickle.dump') as mock_dump:
-                        result = eliminateDuplicates()
-                        assert result.endswith('.pkl')
-                        # Verify duplicates removed
-                        saved_data = mock_dump.call_args[0][0]
-                        assert len(saved_data) == 2
+        with patch('modules.recordDeduplicator.frameExists', return_value=True):
+            with patch('modules.recordDeduplicator.loadDataFrame', return_value=data_with_duplicates):
+                with patch('modules.recordDeduplicator.saveDataFrame') as mock_save:
+                    result = eliminateDuplicates()
+                    assert result.endswith('.parquet')
+                    # Verify duplicates removed
+                    saved_data = mock_save.call_args[0][0]
+                    assert len(saved_data) == 2
 
 
 class TestTransactionProcessor:
     """Test suite for transactionProcessor module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data."""
@@ -96,23 +94,22 @@ class TestTransactionProcessor:
             'InvoiceNo': ['536365', 'C536366', '536367'],
             'CustomerID': [1, 2, 3]
         })
-    
+
     def test_classify_transaction_status(self, transaction_data):
         """Test transaction status classification."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=transaction_data):
-                    with patch('pickle.dump') as mock_dump:
-                        result = classifyTransactionStatus()
-                        saved_data = mock_dump.call_args[0][0]
-                        assert 'TransactionStatus' in saved_data.columns
-                        assert saved_data.iloc[0]['TransactionStatus'] == 'Completed'
-                        assert saved_data.iloc[1]['TransactionStatus'] == 'Cancelled'
+        with patch('modules.transactionProcessor.frameExists', return_value=True):
+            with patch('modules.transactionProcessor.loadDataFrame', return_value=transaction_data):
+                with patch('modules.transactionProcessor.saveDataFrame') as mock_save:
+                    result = classifyTransactionStatus()
+                    saved_data = mock_save.call_args[0][0]
+                    assert 'TransactionStatus' in saved_data.columns
+                    assert saved_data.iloc[0]['TransactionStatus'] == 'Completed'
+                    assert saved_data.iloc[1]['TransactionStatus'] == 'Cancelled'
 
 
 class TestCodeAnomalyDetector:
     """Test suite for codeAnomalyDetector module."""
-    
+
     @pytest.fixture
     def data_with_anomalies(self):
         """Sample data with anomalous stock codes."""
@@ -120,22 +117,21 @@ class TestCodeAnomalyDetector:
             'StockCode': ['85123A', 'M', 'POST', '71053', 'D'],
             'CustomerID': [1, 2, 3, 4, 5]
         })
-    
+
     def test_detect_code_anomalies(self, data_with_anomalies):
         """Test anomalous code detection."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_anomalies):
-                    with patch('pickle.dump') as mock_dump:
-                        result = detectCodeAnomalies()
-                        saved_data = mock_dump.call_args[0][0]
-                        # Should remove codes with 0-1 digits
-                        assert len(saved_data) == 2  # Only valid codes remain
+        with patch('modules.codeAnomalyDetector.frameExists', return_value=True):
+            with patch('modules.codeAnomalyDetector.loadDataFrame', return_value=data_with_anomalies):
+                with patch('modules.codeAnomalyDetector.saveDataFrame') as mock_save:
+                    result = detectCodeAnomalies()
+                    saved_data = mock_save.call_args[0][0]
+                    # Should remove codes with 0-1 digits
+                    assert len(saved_data) == 2  # Only valid codes remain
 
 
 class TestDescriptionCleaner:
     """Test suite for descriptionCleaner module."""
-    
+
     @pytest.fixture
     def data_with_services(self):
         """Sample data with service descriptions."""
@@ -143,24 +139,23 @@ class TestDescriptionCleaner:
             'Description': ['white mug', 'Next Day Carriage', 'blue plate', 'POSTAGE'],
             'CustomerID': [1, 2, 3, 4]
         })
-    
+
     def test_clean_descriptions(self, data_with_services):
         """Test description cleaning."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_services):
-                    with patch('pickle.dump') as mock_dump:
-                        result = cleanDescriptions()
-                        saved_data = mock_dump.call_args[0][0]
-                        # Should remove service descriptions
-                        assert len(saved_data) == 2
-                        # Should uppercase descriptions
-                        assert all(saved_data['Description'].str.isupper())
+        with patch('modules.descriptionCleaner.frameExists', return_value=True):
+            with patch('modules.descriptionCleaner.loadDataFrame', return_value=data_with_services):
+                with patch('modules.descriptionCleaner.saveDataFrame') as mock_save:
+                    result = cleanDescriptions()
+                    saved_data = mock_save.call_args[0][0]
+                    # Should remove service descriptions
+                    assert len(saved_data) == 2
+                    # Should uppercase descriptions
+                    assert all(saved_data['Description'].str.isupper())
 
 
 class TestPriceValidator:
     """Test suite for priceValidator module."""
-    
+
     @pytest.fixture
     def data_with_invalid_prices(self):
         """Sample data with invalid prices."""
@@ -168,18 +163,66 @@ class TestPriceValidator:
             'UnitPrice': [2.50, 0.0, -1.0, 3.99, 0],
             'CustomerID': [1, 2, 3, 4, 5]
         })
-    
+
     def test_validate_pricing(self, data_with_invalid_prices):
         """Test price validation."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=data_with_invalid_prices):
-                    with patch('pickle.dump') as mock_dump:
-                        result = validatePricing()
-                        saved_data = mock_dump.call_args[0][0]
-                        # Should remove zero and negative prices
-                        assert len(saved_data) == 2
-                        assert all(saved_data['UnitPrice'] > 0)
+        with patch('modules.priceValidator.frameExists', return_value=True):
+            with patch('modules.priceValidator.loadDataFrame', return_value=data_with_invalid_prices):
+                with patch('modules.priceValidator.saveDataFrame') as mock_save:
+                    result = validatePricing()
+                    saved_data = mock_save.call_args[0][0]
+                    # Should remove zero and negative prices
+                    assert len(saved_data) == 2
+                    assert all(saved_data['UnitPrice'] > 0)
+
+
+class TestCleaningPipeline:
+    """Test suite for the fused cleaningPipeline module."""
+
+    def test_run_cleaning_applies_all_filters(self):
+        """Test that the fused pass matches the individual stage filters."""
+        from modules import runCleaning
+
+        raw_data = pd.DataFrame({
+            'CustomerID': [1.0, 2.0, np.nan, 4.0, 5.0],
+            'Description': ['white mug', 'POSTAGE', 'red bowl', np.nan, 'blue cup'],
+            'UnitPrice': [2.50, 1.0, 3.0, 4.0, 0.0]
+        })
+
+        cleaned = runCleaning(raw_data)
+
+        # Null CustomerID/Description, the service entry and the zero price
+        # are all removed in one pass
+        assert len(cleaned) == 1
+        assert cleaned['Description'].tolist() == ['WHITE MUG']
+        assert cleaned['CustomerID'].dtype == 'int32'
+
+    def test_run_cleaning_pipeline_end_to_end(self):
+        """Test the file-to-file entry point fusing all six stages."""
+        from modules import runCleaningPipeline
+
+        raw_data = pd.DataFrame({
+            'InvoiceNo': ['536365', '536365', 'C536366', '536367', '536368'],
+            'StockCode': ['85123A', '85123A', '71053', 'POST', '84406B'],
+            'Description': ['white mug', 'white mug', 'red bowl', 'POSTAGE', 'blue cup'],
+            'CustomerID': [1.0, 1.0, 2.0, 3.0, np.nan],
+            'Quantity': [2, 2, 1, 1, 3],
+            'UnitPrice': [2.50, 2.50, 3.0, 1.0, 4.0]
+        })
+
+        with patch('modules.cleaningPipeline.frameExists', return_value=True):
+            with patch('modules.cleaningPipeline.loadDataFrame', return_value=raw_data):
+                with patch('modules.cleaningPipeline.saveDataFrame') as mock_save:
+                    result = runCleaningPipeline()
+                    assert result.endswith('.parquet')
+                    saved_data = mock_save.call_args[0][0]
+
+        # The exact duplicate, the low-digit stock code and the null
+        # CustomerID are removed; status and spend columns are added
+        assert len(saved_data) == 2
+        assert saved_data['Description'].tolist() == ['WHITE MUG', 'RED BOWL']
+        assert saved_data['TransactionStatus'].tolist() == ['Completed', 'Cancelled']
+        assert saved_data['Total_Spend'].dtype == 'float32'
 
 
 if __name__ == '__main__':
@@ -6,8 +6,7 @@ Tests for RFM analysis, behavior analysis, and feature extraction modules.
 
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
-import pickle
+from unittest.mock import Mock, patch
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -23,7 +22,7 @@ from modules import (
 
 class TestCustomerValueAnalyzer:
     """Test suite for customerValueAnalyzer module (RFM)."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data for RFM analysis."""
@@ -41,29 +40,28 @@ class TestCustomerValueAnalyzer:
             'Quantity': [5, 3, 2, 4, 1],
             'UnitPrice': [10.0, 15.0, 20.0, 12.0, 8.0]
         })
-    
+
     def test_analyze_customer_value(self, transaction_data):
         """Test RFM analysis calculation."""
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', return_value=transaction_data):
-                    with patch('pickle.dump') as mock_dump:
-                        result = analyzeCustomerValue()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify RFM metrics exist
-                        assert 'Days_Since_Last_Purchase' in saved_data.columns
-                        assert 'Total_Transactions' in saved_data.columns
-                        assert 'Total_Spend' in saved_data.columns
-                        assert 'Average_Transaction_Value' in saved_data.columns
-                        
-                        # Verify customer count
-                        assert len(saved_data) == 2
+        with patch('modules.customerValueAnalyzer.frameExists', return_value=True):
+            with patch('modules.customerValueAnalyzer.loadDataFrame', return_value=transaction_data):
+                with patch('modules.customerValueAnalyzer.saveDataFrame') as mock_save:
+                    result = analyzeCustomerValue()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify RFM metrics exist
+                    assert 'Days_Since_Last_Purchase' in saved_data.columns
+                    assert 'Total_Transactions' in saved_data.columns
+                    assert 'Total_Spend' in saved_data.columns
+                    assert 'Average_Transaction_Value' in saved_data.columns
+
+                    # Verify customer count
+                    assert len(saved_data) == 2
 
 
 class TestProductAggregator:
     """Test suite for productAggregator module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data."""
@@ -71,7 +69,7 @@ class TestProductAggregator:
             'CustomerID': [1, 1, 1, 2, 2],
             'StockCode': ['A', 'B', 'A', 'C', 'D']
         })
-    
+
     @pytest.fixture
     def rfm_data(self):
         """Sample RFM data."""
@@ -79,28 +77,27 @@ class TestProductAggregator:
             'CustomerID': [1, 2],
             'Total_Spend': [100, 200]
         })
-    
+
     def test_aggregate_product_data(self, transaction_data, rfm_data):
         """Test product aggregation."""
-        def load_side_effect(file):
-            if 'rfm' in str(file.name):
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
                 return rfm_data
             return transaction_data
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', side_effect=load_side_effect):
-                    with patch('pickle.dump') as mock_dump:
-                        result = aggregateProductData()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify unique products calculated
-                        assert 'Unique_Products_Purchased' in saved_data.columns
+
+        with patch('modules.productAggregator.frameExists', return_value=True):
+            with patch('modules.productAggregator.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.productAggregator.saveDataFrame') as mock_save:
+                    result = aggregateProductData()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify unique products calculated
+                    assert 'Unique_Products_Purchased' in saved_data.columns
 
 
 class TestBehaviorAnalyzer:
     """Test suite for behaviorAnalyzer module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data with temporal info."""
@@ -112,35 +109,34 @@ class TestBehaviorAnalyzer:
                 '2011-12-03 16:00:00'
             ]
         })
-    
+
     def test_analyze_behavior_patterns(self, transaction_data):
         """Test behavior pattern analysis."""
-        product_data = pd.DataFrame({
+        base_metrics = pd.DataFrame({
             'CustomerID': [1, 2],
             'Total_Spend': [100, 200]
         })
-        
-        def load_side_effect(file):
-            if 'product' in str(file.name):
-                return product_data
+
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
+                return base_metrics
             return transaction_data
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', side_effect=load_side_effect):
-                    with patch('pickle.dump') as mock_dump:
-                        result = analyzeBehaviorPatterns()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify behavioral metrics
-                        assert 'Average_Days_Between_Purchases' in saved_data.columns
-                        assert 'Day_Of_Week' in saved_data.columns
-                        assert 'Hour' in saved_data.columns
+
+        with patch('modules.behaviorAnalyzer.frameExists', return_value=True):
+            with patch('modules.behaviorAnalyzer.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.behaviorAnalyzer.saveDataFrame') as mock_save:
+                    result = analyzeBehaviorPatterns()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify behavioral metrics
+                    assert 'Average_Days_Between_Purchases' in saved_data.columns
+                    assert 'Day_Of_Week' in saved_data.columns
+                    assert 'Hour' in saved_data.columns
 
 
 class TestLocationFeatureBuilder:
     """Test suite for locationFeatureBuilder module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data with countries."""
@@ -148,35 +144,34 @@ class TestLocationFeatureBuilder:
             'CustomerID': [1, 1, 2, 2, 2],
             'Country': ['United Kingdom', 'United Kingdom', 'France', 'France', 'France']
         })
-    
+
     def test_build_location_features(self, transaction_data):
         """Test location feature building."""
-        behavior_data = pd.DataFrame({
+        base_metrics = pd.DataFrame({
             'CustomerID': [1, 2],
             'Total_Spend': [100, 200]
         })
-        
-        def load_side_effect(file):
-            if 'behavior' in str(file.name):
-                return behavior_data
+
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
+                return base_metrics
             return transaction_data
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', side_effect=load_side_effect):
-                    with patch('pickle.dump') as mock_dump:
-                        result = buildLocationFeatures()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify location features
-                        assert 'Is_UK' in saved_data.columns
-                        assert saved_data.loc[saved_data['CustomerID'] == 1, 'Is_UK'].values[0] == 1
-                        assert saved_data.loc[saved_data['CustomerID'] == 2, 'Is_UK'].values[0] == 0
+
+        with patch('modules.locationFeatureBuilder.frameExists', return_value=True):
+            with patch('modules.locationFeatureBuilder.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.locationFeatureBuilder.saveDataFrame') as mock_save:
+                    result = buildLocationFeatures()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify location features
+                    assert 'Is_UK' in saved_data.columns
+                    assert saved_data.loc[saved_data['CustomerID'] == 1, 'Is_UK'].values[0] == 1
+                    assert saved_data.loc[saved_data['CustomerID'] == 2, 'Is_UK'].values[0] == 0
 
 
 class TestCancellationAnalyzer:
     """Test suite for cancellationAnalyzer module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data with cancellations."""
@@ -184,34 +179,33 @@ class TestCancellationAnalyzer:
             'CustomerID': [1, 1, 1, 2, 2],
             'InvoiceNo': ['A', 'C123', 'B', 'C', 'D']
         })
-    
+
     def test_analyze_cancellations(self, transaction_data):
         """Test cancellation analysis."""
-        location_data = pd.DataFrame({
+        base_metrics = pd.DataFrame({
             'CustomerID': [1, 2],
             'Is_UK': [1, 0]
         })
-        
-        def load_side_effect(file):
-            if 'location' in str(file.name):
-                return location_data
+
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
+                return base_metrics
             return transaction_data
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', side_effect=load_side_effect):
-                    with patch('pickle.dump') as mock_dump:
-                        result = analyzeCancellations()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify cancellation metrics
-                        assert 'Cancellation_Frequency' in saved_data.columns
-                        assert 'Cancellation_Rate' in saved_data.columns
+
+        with patch('modules.cancellationAnalyzer.frameExists', return_value=True):
+            with patch('modules.cancellationAnalyzer.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.cancellationAnalyzer.saveDataFrame') as mock_save:
+                    result = analyzeCancellations()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify cancellation metrics
+                    assert 'Cancellation_Frequency' in saved_data.columns
+                    assert 'Cancellation_Rate' in saved_data.columns
 
 
 class TestTemporalPatternExtractor:
     """Test suite for temporalPatternExtractor module."""
-    
+
     @pytest.fixture
     def transaction_data(self):
         """Sample transaction data for temporal analysis."""
@@ -224,30 +218,57 @@ class TestTemporalPatternExtractor:
             'Quantity': [5, 3, 4, 2, 6],
             'UnitPrice': [10.0, 15.0, 12.0, 20.0, 8.0]
         })
-    
+
     def test_extract_temporal_patterns(self, transaction_data):
         """Test temporal pattern extraction."""
-        cancellation_data = pd.DataFrame({
+        base_metrics = pd.DataFrame({
             'CustomerID': [1, 2],
             'Cancellation_Rate': [0.1, 0.2]
         })
-        
-        def load_side_effect(file):
-            if 'cancellation' in str(file.name):
-                return cancellation_data
+
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
+                return base_metrics
             return transaction_data
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('builtins.open', mock_open()):
-                with patch('pickle.load', side_effect=load_side_effect):
-                    with patch('pickle.dump') as mock_dump:
-                        result = extractTemporalPatterns()
-                        saved_data = mock_dump.call_args[0][0]
-                        
-                        # Verify temporal metrics
-                        assert 'Monthly_Spending_Mean' in saved_data.columns
-                        assert 'Monthly_Spending_Std' in saved_data.columns
-                        assert 'Spending_Trend' in saved_data.columns
+
+        with patch('modules.temporalPatternExtractor.frameExists', return_value=True):
+            with patch('modules.temporalPatternExtractor.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.temporalPatternExtractor.saveDataFrame') as mock_save:
+                    result = extractTemporalPatterns()
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Verify temporal metrics
+                    assert 'Monthly_Spending_Mean' in saved_data.columns
+                    assert 'Monthly_Spending_Std' in saved_data.columns
+                    assert 'Spending_Trend' in saved_data.columns
+
+
+class TestFeatureMerger:
+    """Test suite for featureMerger module."""
+
+    def test_merge_features(self, sample_customer_data):
+        """Test joining branch feature columns onto the RFM base."""
+        from modules import mergeFeatures
+
+        base_data = sample_customer_data[['CustomerID', 'Total_Spend']].copy()
+        branch_data = sample_customer_data[['CustomerID', 'Total_Spend', 'Is_UK']].copy()
+
+        def load_side_effect(path, columns=None):
+            if 'rfm' in str(path):
+                return base_data
+            return branch_data
+
+        with patch('modules.featureMerger.frameExists', return_value=True):
+            with patch('modules.featureMerger.loadDataFrame', side_effect=load_side_effect):
+                with patch('modules.featureMerger.saveDataFrame') as mock_save:
+                    result = mergeFeatures(featureDataPaths=['branch_features.parquet'])
+                    assert result.endswith('.parquet')
+                    saved_data = mock_save.call_args[0][0]
+
+                    # Only the branch's new column is merged; the shared
+                    # base columns are not duplicated
+                    assert list(saved_data.columns) == ['CustomerID', 'Total_Spend', 'Is_UK']
+                    assert len(saved_data) == len(base_data)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,233 @@
+"""
+Test Suite for Pipeline Infrastructure Modules
+
+Tests for the frameStore persistence helpers, stage memoization,
+logging configuration, and the outlierRemover stage built on them.
+"""
+
+import logging
+import os
+import pickle
+from logging.handlers import MemoryHandler
+
+import pytest
+import numpy as np
+import pandas as pd
+from modules import removeOutliers
+from modules.frameStore import (
+    frameExists,
+    frameColumns,
+    loadDataFrame,
+    saveDataFrame,
+    stageIsCurrent,
+    writeStageKey,
+)
+from modules.logConfig import configureLogging
+
+
+@pytest.fixture
+def sample_frame():
+    """Small frame for round-trip tests."""
+    return pd.DataFrame({
+        'CustomerID': [1, 2, 3],
+        'Total_Spend': [100.0, 200.0, 300.0],
+        'Is_UK': [1, 0, 1]
+    })
+
+
+class TestFrameStore:
+    """Test suite for the frameStore persistence helpers."""
+
+    def test_parquet_round_trip(self, tmp_path, sample_frame):
+        """Test saving and reloading a Parquet artifact."""
+        data_path = tmp_path / 'frame.parquet'
+        result = saveDataFrame(sample_frame, data_path)
+        assert result == str(data_path)
+        assert frameExists(data_path)
+
+        loaded = loadDataFrame(data_path)
+        pd.testing.assert_frame_equal(loaded, sample_frame)
+
+        # Column projection loads only the requested subset
+        projected = loadDataFrame(data_path, columns=['CustomerID', 'Is_UK'])
+        assert list(projected.columns) == ['CustomerID', 'Is_UK']
+
+    def test_pickle_round_trip(self, tmp_path, sample_frame):
+        """Test the pickle fallback for non-Parquet suffixes."""
+        data_path = tmp_path / 'frame.pkl'
+        saveDataFrame(sample_frame, data_path)
+        assert frameExists(data_path)
+
+        loaded = loadDataFrame(data_path, columns=['CustomerID'])
+        assert list(loaded.columns) == ['CustomerID']
+
+    def test_legacy_pickle_fallback(self, tmp_path, sample_frame):
+        """Test that a missing Parquet falls back to its pickle sibling."""
+        pickle_path = tmp_path / 'frame.pkl'
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(sample_frame, f)
+
+        parquet_path = tmp_path / 'frame.parquet'
+        assert frameExists(parquet_path)
+        loaded = loadDataFrame(parquet_path, columns=['CustomerID'])
+        assert list(loaded.columns) == ['CustomerID']
+
+    def test_missing_artifact(self, tmp_path):
+        """Test behaviour when no artifact exists at all."""
+        missing_path = tmp_path / 'missing.parquet'
+        assert not frameExists(missing_path)
+        assert frameColumns(missing_path) is None
+        with pytest.raises(FileNotFoundError):
+            loadDataFrame(missing_path)
+
+    def test_frame_columns(self, tmp_path, sample_frame):
+        """Test schema inspection of Parquet and legacy pickle artifacts."""
+        parquet_path = tmp_path / 'frame.parquet'
+        saveDataFrame(sample_frame, parquet_path)
+        assert frameColumns(parquet_path) == ['CustomerID', 'Total_Spend', 'Is_UK']
+
+        # Legacy pickle artifacts report columns through the same helper
+        pickle_path = tmp_path / 'legacy.pkl'
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(sample_frame, f)
+        assert frameColumns(tmp_path / 'legacy.parquet') == ['CustomerID', 'Total_Spend', 'Is_UK']
+
+
+class TestStageMemoization:
+    """Test suite for the stage cache-key helpers."""
+
+    @pytest.fixture
+    def stage_paths(self, tmp_path, sample_frame):
+        """A saved source artifact and an output path for a stage."""
+        source_path = tmp_path / 'source.parquet'
+        saveDataFrame(sample_frame, source_path)
+        return source_path, tmp_path / 'output.parquet'
+
+    def test_stage_not_current_without_output(self, stage_paths):
+        """Test that a stage with no output is never current."""
+        source_path, output_path = stage_paths
+        assert not stageIsCurrent(output_path, [source_path])
+
+    def test_stage_not_current_without_key(self, stage_paths, sample_frame):
+        """Test that an output without a recorded key is not current."""
+        source_path, output_path = stage_paths
+        saveDataFrame(sample_frame, output_path)
+        assert not stageIsCurrent(output_path, [source_path])
+
+    def test_stage_current_after_key_write(self, stage_paths, sample_frame):
+        """Test the skip path after writeStageKey records the inputs."""
+        source_path, output_path = stage_paths
+        saveDataFrame(sample_frame, output_path)
+        writeStageKey(output_path, [source_path])
+        assert stageIsCurrent(output_path, [source_path])
+
+    def test_source_change_invalidates_stage(self, stage_paths, sample_frame):
+        """Test that touching a source file invalidates the cached output."""
+        source_path, output_path = stage_paths
+        saveDataFrame(sample_frame, output_path)
+        writeStageKey(output_path, [source_path])
+
+        # Bump the source mtime past the recorded one
+        source_stat = os.stat(source_path)
+        os.utime(source_path, ns=(source_stat.st_atime_ns,
+                                  source_stat.st_mtime_ns + 1_000_000))
+        assert not stageIsCurrent(output_path, [source_path])
+
+    def test_stage_params_invalidate_stage(self, stage_paths, sample_frame):
+        """Test that different stage parameters miss the cache."""
+        source_path, output_path = stage_paths
+        saveDataFrame(sample_frame, output_path)
+        writeStageKey(output_path, [source_path], stageParams={'rate': 0.05})
+
+        assert stageIsCurrent(output_path, [source_path], stageParams={'rate': 0.05})
+        assert not stageIsCurrent(output_path, [source_path], stageParams={'rate': 0.2})
+
+    def test_stage_version_invalidates_stage(self, stage_paths, sample_frame):
+        """Test that bumping the stage version forces recomputation."""
+        source_path, output_path = stage_paths
+        saveDataFrame(sample_frame, output_path)
+        writeStageKey(output_path, [source_path], stageVersion=1)
+        assert not stageIsCurrent(output_path, [source_path], stageVersion=2)
+
+    def test_missing_source_never_current(self, tmp_path, sample_frame):
+        """Test that a stage whose source vanished is not current."""
+        source_path = tmp_path / 'gone.parquet'
+        output_path = tmp_path / 'output.parquet'
+        saveDataFrame(sample_frame, output_path)
+        writeStageKey(output_path, [source_path])
+        assert not stageIsCurrent(output_path, [source_path])
+
+
+class TestLogConfig:
+    """Test suite for the logConfig module."""
+
+    def test_configure_logging_idempotent(self):
+        """Test that repeated configuration doesn't stack handlers."""
+        root_logger = logging.getLogger()
+        original_handlers = list(root_logger.handlers)
+        try:
+            configureLogging()
+            buffered = [h for h in root_logger.handlers
+                        if isinstance(h, MemoryHandler)]
+            assert len(buffered) == 1
+            assert buffered[0].flushLevel == logging.ERROR
+
+            # A second call must not add another handler
+            configureLogging()
+            assert sum(isinstance(h, MemoryHandler)
+                       for h in root_logger.handlers) == 1
+        finally:
+            for handler in list(root_logger.handlers):
+                if handler not in original_handlers:
+                    root_logger.removeHandler(handler)
+                    handler.close()
+
+
+class TestOutlierRemover:
+    """Test suite for the outlierRemover stage."""
+
+    @pytest.fixture
+    def feature_paths(self, tmp_path):
+        """A saved customer feature frame and an output path."""
+        np.random.seed(42)
+        feature_data = pd.DataFrame({
+            'CustomerID': np.arange(60),
+            'Total_Spend': np.random.uniform(50, 500, 60),
+            'Total_Transactions': np.random.randint(1, 20, 60)
+        })
+        source_path = tmp_path / 'customer_features.parquet'
+        saveDataFrame(feature_data, source_path)
+        return source_path, tmp_path / 'outliers_removed.parquet'
+
+    def test_remove_outliers(self, feature_paths):
+        """Test outlier removal drops the expected share of records."""
+        source_path, output_path = feature_paths
+        result = removeOutliers(source_path, output_path, contaminationRate=0.1)
+        assert result == str(output_path)
+
+        cleaned = loadDataFrame(output_path)
+        assert len(cleaned) == 54  # 60 records minus 10% contamination
+
+    def test_remove_outliers_skips_when_current(self, feature_paths):
+        """Test that an unchanged input reuses the cached output."""
+        source_path, output_path = feature_paths
+        removeOutliers(source_path, output_path, contaminationRate=0.1)
+        cached_mtime = os.stat(output_path).st_mtime_ns
+
+        # Same input and rate: the stage skips the fit and rewrite
+        removeOutliers(source_path, output_path, contaminationRate=0.1)
+        assert os.stat(output_path).st_mtime_ns == cached_mtime
+
+        # A different rate misses the cache and recomputes
+        removeOutliers(source_path, output_path, contaminationRate=0.2)
+        assert len(loadDataFrame(output_path)) == 48
+
+    def test_remove_outliers_missing_source(self, tmp_path):
+        """Test outlier removal with a missing source file."""
+        with pytest.raises(FileNotFoundError):
+            removeOutliers(tmp_path / 'missing.parquet',
+                           tmp_path / 'out.parquet')
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
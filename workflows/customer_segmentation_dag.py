@@ -24,20 +24,28 @@ from modules import (
     fetchDataset,
     extractArchive,
     loadDataset,
-    processMissingValues,
-    eliminateDuplicates,
-    classifyTransactionStatus,
-    detectCodeAnomalies,
-    cleanDescriptions,
-    validatePricing,
+    runCleaningPipeline,
     analyzeCustomerValue,
     aggregateProductData,
     analyzeBehaviorPatterns,
     buildLocationFeatures,
     analyzeCancellations,
     extractTemporalPatterns,
+    mergeFeatures,
     removeOutliers
 )
+from modules.logConfig import configureLogging
+
+# Task processes import this file before running their callable, so the
+# module loggers are wired to stdout in every worker (idempotent across
+# repeated DAG-file parses)
+configureLogging()
+
+
+# Shared stage artifact paths for the fan-out below
+PROCESSED_DATA_DIR = Path(__file__).parent.parent / 'datasets' / 'processed'
+RFM_DATA_PATH = str(PROCESSED_DATA_DIR / 'rfm_analysis.parquet')
+CUSTOMER_FEATURES_PATH = str(PROCESSED_DATA_DIR / 'customer_features.parquet')
 
 
 # Default arguments for the DAG
@@ -128,110 +136,102 @@ with TaskGroup('data_acquisition', dag=dag) as data_acquisition_group:
 
 
 # Data Cleaning Task Group
+# The six cleaning stages are strictly sequential row filters over one
+# frame; running them as one fused task keeps the frame in memory and
+# replaces five intermediate load/save round-trips with a single write
 with TaskGroup('data_cleaning', dag=dag) as data_cleaning_group:
-    
+
     start_cleaning = EmptyOperator(
         task_id='start',
         dag=dag
     )
-    
-    process_nulls = PythonOperator(
-        task_id='process_missing_values',
-        python_callable=processMissingValues,
-        dag=dag
-    )
-    
-    remove_duplicates = PythonOperator(
-        task_id='eliminate_duplicates',
-        python_callable=eliminateDuplicates,
-        dag=dag
-    )
-    
-    classify_transactions = PythonOperator(
-        task_id='classify_transaction_status',
-        python_callable=classifyTransactionStatus,
-        dag=dag
-    )
-    
-    detect_anomalies = PythonOperator(
-        task_id='detect_code_anomalies',
-        python_callable=detectCodeAnomalies,
-        dag=dag
-    )
-    
-    clean_desc = PythonOperator(
-        task_id='clean_descriptions',
-        python_callable=cleanDescriptions,
-        dag=dag
-    )
-    
-    validate_prices = PythonOperator(
-        task_id='validate_pricing',
-        python_callable=validatePricing,
+
+    clean_all = PythonOperator(
+        task_id='clean_all',
+        python_callable=runCleaningPipeline,
         dag=dag
     )
-    
+
     end_cleaning = EmptyOperator(
         task_id='end',
         dag=dag
     )
-    
-    (start_cleaning >> process_nulls >> remove_duplicates >> 
-     classify_transactions >> detect_anomalies >> clean_desc >> 
-     validate_prices >> end_cleaning)
+
+    start_cleaning >> clean_all >> end_cleaning
 
 
 # Feature Engineering Task Group
+# The five feature branches each need only the cleaned transactions and
+# the RFM base, so they fan out from rfm_analysis and run concurrently;
+# merge_features joins their new columns on CustomerID at the end. The
+# critical path is the slowest branch instead of the sum of all five
 with TaskGroup('feature_engineering', dag=dag) as feature_engineering_group:
-    
+
     start_features = EmptyOperator(
         task_id='start',
         dag=dag
     )
-    
+
     rfm_analysis = PythonOperator(
         task_id='analyze_customer_value',
         python_callable=analyzeCustomerValue,
         dag=dag
     )
-    
+
     product_agg = PythonOperator(
         task_id='aggregate_product_data',
         python_callable=aggregateProductData,
+        op_kwargs={'rfmDataPath': RFM_DATA_PATH},
         dag=dag
     )
-    
+
     behavior_analysis = PythonOperator(
         task_id='analyze_behavior_patterns',
         python_callable=analyzeBehaviorPatterns,
+        op_kwargs={'baseMetricsPath': RFM_DATA_PATH},
         dag=dag
     )
-    
+
     location_features = PythonOperator(
         task_id='build_location_features',
         python_callable=buildLocationFeatures,
+        op_kwargs={'baseMetricsPath': RFM_DATA_PATH},
         dag=dag
     )
-    
+
     cancellation_analysis = PythonOperator(
         task_id='analyze_cancellations',
         python_callable=analyzeCancellations,
+        op_kwargs={'baseMetricsPath': RFM_DATA_PATH},
         dag=dag
     )
-    
+
     temporal_patterns = PythonOperator(
         task_id='extract_temporal_patterns',
         python_callable=extractTemporalPatterns,
+        op_kwargs={'baseMetricsPath': RFM_DATA_PATH},
         dag=dag
     )
-    
+
+    merge_feature_frames = PythonOperator(
+        task_id='merge_features',
+        python_callable=mergeFeatures,
+        dag=dag
+    )
+
     end_features = EmptyOperator(
         task_id='end',
         dag=dag
     )
-    
-    (start_features >> rfm_analysis >> product_agg >> behavior_analysis >> 
-     location_features >> cancellation_analysis >> temporal_patterns >> end_features)
+
+    feature_branches = [
+        product_agg,
+        behavior_analysis,
+        location_features,
+        cancellation_analysis,
+        temporal_patterns
+    ]
+    start_features >> rfm_analysis >> feature_branches >> merge_feature_frames >> end_features
 
 
 # Advanced Analytics Task Group
@@ -245,6 +245,7 @@ with TaskGroup('advanced_analytics', dag=dag) as advanced_analytics_group:
     remove_outlier_records = PythonOperator(
         task_id='remove_outliers',
         python_callable=removeOutliers,
+        op_kwargs={'sourceDataPath': CUSTOMER_FEATURES_PATH},
         dag=dag
     )
     